@@ -0,0 +1,235 @@
+"""Benchmark the email send path against a local SMTP sink.
+
+Starts a throwaway SMTP server in its own process, fills a scratch database
+with N queued emails carrying a synthetic CV and cover letter, and sends
+them with the same outbox, connection pool, rate limiter and attachment
+cache the app uses. Reports messages per second, per-message latency
+(claim, build, send and commit), CPU time and peak memory of the sending
+process. No real mail is sent.
+
+    python benchmark_email.py
+    python benchmark_email.py --messages 2000 --connections 4 --cv-kb 4096 --server-delay-ms 20
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+import socketserver
+import multiprocessing
+from datetime import datetime
+
+from benchmark_utils import peak_rss_mb, percentile
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: accepts any login and discards every message"""
+
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+
+    def handle(self):
+        self.reply('220 localhost benchmark sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b'EHLO', b'HELO'):
+                self.reply('250-localhost')
+                self.reply('250-AUTH PLAIN')
+                self.reply('250 8BITMIME')
+            elif command == b'AUTH':
+                self.reply('235 Authentication successful')
+            elif command == b'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                for data in iter(self.rfile.readline, b''):
+                    if data == b'.\r\n':
+                        break
+                    size += len(data)
+                if self.server.delay:
+                    time.sleep(self.server.delay)
+                with self.server.lock:
+                    self.server.received += 1
+                    self.server.received_bytes += size
+                self.reply('250 OK queued')
+            elif command == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP
+                self.reply('250 OK')
+
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def run_sink(delay, ready, stop, results):
+    """Serve the sink until stop is set (runs in its own process)"""
+    server = SinkServer(('127.0.0.1', 0), SinkHandler)
+    server.delay = delay
+    server.lock = threading.Lock()
+    server.received = 0
+    server.received_bytes = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ready.put(server.server_address[1])
+    stop.wait()
+    server.shutdown()
+    results.put({'received': server.received, 'received_bytes': server.received_bytes})
+
+
+def create_scratch_queue(db_path, messages, body_chars):
+    """Fill a scratch database, made with the app's schema, with one job and one Pending email per message"""
+    from main import connect_db, init_schema, init_job_search_index
+
+    conn = connect_db(db_path)
+    init_schema(conn)
+    init_job_search_index(conn)
+    body = ("I am writing to apply for the position advertised on your careers page. " * 50)[:body_chars]
+    created = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for i in range(messages):
+        job_id = conn.execute(
+            'INSERT INTO jobs (company_name, job_title, email, date_found) VALUES (?, ?, ?, ?)',
+            (f'Company {i}', 'Software Engineer', f'jobs{i}@example.com', created[:10])
+        ).lastrowid
+        conn.execute('''
+            INSERT INTO email_queue (job_id, recipient_email, subject, body, created_date)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (job_id, f'jobs{i}@example.com', f'Application for Software Engineer at Company {i}', body, created))
+    conn.commit()
+    conn.close()
+
+
+def create_attachment(path, size_kb):
+    with open(path, 'wb') as file:
+        file.write(os.urandom(size_kb * 1024))
+    return path
+
+
+def run_benchmark(args):
+    from main import EmailSender, SmtpPool, TokenBucket, AttachmentCache, build_email_message
+
+    class TimedEmailSender(EmailSender):
+        """EmailSender recording how long each message takes from claim to commit"""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.latencies = []
+
+        def _deliver(self, conn, email_id):
+            start = time.perf_counter()
+            super()._deliver(conn, email_id)
+            self.latencies.append(time.perf_counter() - start)
+
+    scratch = tempfile.mkdtemp(prefix='email_benchmark_')
+    ready, results = multiprocessing.Queue(), multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    sink = multiprocessing.Process(target=run_sink, args=(args.server_delay_ms / 1000, ready, stop, results))
+    sink.start()
+    try:
+        port = ready.get(timeout=10)
+        db_path = os.path.join(scratch, 'outbox.db')
+        create_scratch_queue(db_path, args.messages, args.body_chars)
+        attachments = [create_attachment(os.path.join(scratch, 'cv.pdf'), args.cv_kb)]
+        if args.cover_letter_kb:
+            attachments.append(create_attachment(os.path.join(scratch, 'cover_letter.pdf'), args.cover_letter_kb))
+        cache = AttachmentCache()
+
+        def build_message(recipient_email, subject, body, message_id):
+            return build_email_message('Benchmark <benchmark@example.com>', recipient_email, subject, body,
+                                       message_id, attachments, cache)
+
+        # 0 emails per minute means no rate limit
+        rate = args.rate / 60.0 if args.rate else 1e9
+        done = threading.Event()
+        sender = TimedEmailSender(
+            SmtpPool('127.0.0.1', port, 'benchmark@example.com', 'password', size=args.connections, starttls=False),
+            TokenBucket(rate, capacity=args.connections),
+            build_message,
+            db_path=db_path,
+            on_done=lambda sent, failed, cancelled: done.set(),
+            chunk_size=args.chunk_size
+        )
+
+        rss_before = peak_rss_mb()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        sender.start()
+        done.wait()
+        elapsed = time.perf_counter() - start
+        cpu_time = time.process_time() - cpu_start
+
+        stop.set()
+        received = results.get(timeout=10)
+        latencies = [latency * 1000 for latency in sender.latencies]
+        return {
+            'messages': args.messages,
+            'sent': sender.sent,
+            'failed': sender.failed,
+            'received': received['received'],
+            'received_mb': received['received_bytes'] / (1024 * 1024),
+            'connections': args.connections,
+            'elapsed_s': elapsed,
+            'messages_per_s': sender.sent / elapsed if elapsed else 0.0,
+            'latency_mean_ms': statistics.mean(latencies) if latencies else None,
+            'latency_p50_ms': percentile(latencies, 50) if latencies else None,
+            'latency_p99_ms': percentile(latencies, 99) if latencies else None,
+            'cpu_s': cpu_time,
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_rss_before_mb': rss_before,
+        }
+    finally:
+        stop.set()
+        sink.join(timeout=10)
+        if sink.is_alive():
+            sink.terminate()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def print_report(result):
+    def number(value, fmt):
+        return format(value, fmt) if value is not None else 'n/a'
+
+    print(f"messages        {result['sent']} sent, {result['failed']} failed, "
+          f"{result['received']} received by the sink ({result['received_mb']:.1f} MB)")
+    print(f"connections     {result['connections']}")
+    print(f"elapsed         {result['elapsed_s']:.2f} s")
+    print(f"throughput      {result['messages_per_s']:.1f} messages/s")
+    print(f"latency         mean {number(result['latency_mean_ms'], '.1f')} ms, "
+          f"p50 {number(result['latency_p50_ms'], '.1f')} ms, p99 {number(result['latency_p99_ms'], '.1f')} ms")
+    print(f"cpu time        {result['cpu_s']:.2f} s")
+    print(f"peak RSS        {number(result['peak_rss_mb'], '.0f')} MB "
+          f"({number(result['peak_rss_before_mb'], '.0f')} MB before sending)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sending queued emails through a local SMTP sink")
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--connections', type=int, default=2)
+    parser.add_argument('--rate', type=int, default=0, help="Emails per minute (0 = unlimited)")
+    parser.add_argument('--chunk-size', type=int, default=50)
+    parser.add_argument('--cv-kb', type=int, default=2048, help="Size of the synthetic CV attachment")
+    parser.add_argument('--cover-letter-kb', type=int, default=100, help="Size of the cover letter (0 = none)")
+    parser.add_argument('--body-chars', type=int, default=2000)
+    parser.add_argument('--server-delay-ms', type=float, default=0, help="Time the sink takes to accept a message")
+    parser.add_argument('--output', help="Also write the raw results to this JSON file")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    print_report(result)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if result['sent'] != args.messages or result['received'] != args.messages:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
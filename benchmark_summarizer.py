@@ -0,0 +1,154 @@
+"""Benchmark the summarization backends on a fixed set of CV excerpts.
+
+Each backend is run in its own subprocess so its peak RSS is measured in
+isolation. Reports load time, per-item latency, batched throughput, peak RSS
+and how closely each backend's summaries match the plain transformers
+pipeline.
+
+    python benchmark_summarizer.py
+    python benchmark_summarizer.py --backends transformers torch-int8 --batch-size 4
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from difflib import SequenceMatcher
+
+from benchmark_utils import peak_rss_mb, percentile
+
+CV_EXCERPTS = [
+    "Senior Software Engineer, Acme Corp (2019 - present). Led a team of five engineers building a "
+    "Python and Django platform for processing insurance claims. Migrated the monolith to services on "
+    "Kubernetes, cutting deployment time from two hours to ten minutes. Introduced CI with GitHub Actions "
+    "and raised test coverage from 40% to 85%. Mentored junior developers and ran weekly code reviews.",
+    "Data Analyst, Northwind Traders (2016 - 2019). Built SQL reporting pipelines and Tableau dashboards "
+    "used by the sales and finance teams. Automated the monthly revenue forecast in Python with pandas and "
+    "statsmodels, saving three days of manual work each month. Worked with stakeholders to define KPIs and "
+    "cleaned up the customer master data across three legacy CRMs.",
+    "Marketing Coordinator, Bright Ideas Agency (2014 - 2016). Planned and ran email and social media "
+    "campaigns for twelve clients in retail and hospitality. Managed a monthly ad budget of $50,000 across "
+    "Google Ads and Facebook, improving cost per acquisition by 30%. Wrote copy for landing pages and "
+    "coordinated with designers and printers on event material.",
+    "Nurse, St. Mary's Hospital (2012 - 2018). Provided care for up to eight patients per shift on a busy "
+    "surgical ward. Administered medication, monitored vital signs and updated electronic health records. "
+    "Trained new staff on infection control procedures and served on the ward's patient safety committee.",
+    "DevOps Engineer, Cloudline (2018 - 2021). Maintained AWS infrastructure with Terraform and Ansible for "
+    "a SaaS product serving two million users. Set up Prometheus and Grafana monitoring and an on-call "
+    "rotation, reducing mean time to recovery by half. Wrote Bash and Go tooling for blue-green deploys "
+    "and database backups.",
+    "Project Manager, BuildRight Construction (2010 - 2015). Managed residential projects worth up to "
+    "$4 million from tender to handover. Coordinated subcontractors, schedules and budgets, delivering "
+    "nine of ten projects on time. Negotiated supplier contracts and handled health and safety compliance "
+    "on site.",
+]
+
+SUMMARY_PARAMS = {'max_length': 80, 'min_length': 30, 'do_sample': False}
+
+
+def run_backend(backend, model_name, batch_size, repeat):
+    """Load one backend and time it (runs inside the worker subprocess)"""
+    from main import SUMMARY_BACKENDS
+
+    start = time.perf_counter()
+    summarizer = SUMMARY_BACKENDS[backend](model_name)
+    load_time = time.perf_counter() - start
+
+    # Warm-up so one-off initialisation is not counted as latency
+    summarizer(CV_EXCERPTS[0], truncation=True, **SUMMARY_PARAMS)
+
+    latencies = []
+    summaries = []
+    for _ in range(repeat):
+        summaries = []
+        for text in CV_EXCERPTS:
+            start = time.perf_counter()
+            result = summarizer(text, truncation=True, **SUMMARY_PARAMS)
+            latencies.append(time.perf_counter() - start)
+            summaries.append(result[0]['summary_text'])
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        summarizer(CV_EXCERPTS, batch_size=batch_size, truncation=True, **SUMMARY_PARAMS)
+    batched_time = time.perf_counter() - start
+
+    return {
+        'backend': backend,
+        'load_s': load_time,
+        'latencies': latencies,
+        'throughput': len(CV_EXCERPTS) * repeat / batched_time,
+        'peak_rss_mb': peak_rss_mb(),
+        'summaries': summaries,
+    }
+
+
+def similarity(a, b):
+    """Token-level similarity between two summaries (0..1)"""
+    return SequenceMatcher(None, a.split(), b.split()).ratio()
+
+
+def benchmark(backends, model_name, batch_size, repeat):
+    """Run every backend in a fresh interpreter and collect the results"""
+    results = {}
+    for backend in backends:
+        print(f"Benchmarking {backend}...", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, __file__, '--worker', backend, '--model', model_name,
+             '--batch-size', str(batch_size), '--repeat', str(repeat)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()
+            results[backend] = {'backend': backend, 'error': error[-1] if error else 'failed'}
+            continue
+        results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+    return results
+
+
+def print_report(results, baseline='transformers'):
+    reference = results.get(baseline, {}).get('summaries')
+    header = f"{'backend':<14}{'load s':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'items/s':>10}{'peak MB':>10}{'similarity':>12}"
+    print(header)
+    print('-' * len(header))
+    for backend, result in results.items():
+        if 'error' in result:
+            print(f"{backend:<14}failed: {result['error']}")
+            continue
+        latencies = [l * 1000 for l in result['latencies']]
+        peak = f"{result['peak_rss_mb']:.0f}" if result['peak_rss_mb'] is not None else 'n/a'
+        if reference:
+            sim = statistics.mean(similarity(a, b) for a, b in zip(result['summaries'], reference))
+            sim = f"{sim:.3f}"
+        else:
+            sim = 'n/a'
+        print(f"{backend:<14}{result['load_s']:>8.1f}{statistics.mean(latencies):>10.0f}"
+              f"{percentile(latencies, 50):>10.0f}{percentile(latencies, 95):>10.0f}"
+              f"{result['throughput']:>10.2f}{peak:>10}{sim:>12}")
+
+
+def main():
+    from main import SUMMARY_BACKENDS, DEFAULT_SUMMARY_MODEL
+
+    parser = argparse.ArgumentParser(description="Benchmark summarization backends")
+    parser.add_argument('--backends', nargs='+', default=list(SUMMARY_BACKENDS), choices=list(SUMMARY_BACKENDS))
+    parser.add_argument('--model', default=DEFAULT_SUMMARY_MODEL)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--output', help="Also write the raw results to this JSON file")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.model, args.batch_size, args.repeat)))
+        return
+
+    results = benchmark(args.backends, args.model, args.batch_size, args.repeat)
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
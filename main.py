@@ -1,43 +1,2390 @@
 import os
 import re
+import gzip
 import json
 import time
 import docx
 import PyPDF2
+import queue
+import struct
+import bisect
+import hashlib
+import functools
+import tempfile
 import random
 import sqlite3
 import logging
 import smtplib
 import threading
+import multiprocessing
 import requests
+import numpy as np
 import tkinter as tk
 
-from transformers import pipeline
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
 from user_agents import parse
-from datetime import datetime
-from urllib.parse import quote_plus, urljoin
+from datetime import datetime, timedelta
+from urllib.parse import quote_plus, urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from email import encoders
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
+from email.utils import make_msgid, parseaddr
+from email.policy import compat32
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 
-def get_random_user_agent():
-    user_agents = [
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15'
-    ]
-    return random.choice(user_agents)
+def get_random_user_agent():
+    user_agents = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15'
+    ]
+    return random.choice(user_agents)
+
+# Summarization checkpoints offered in the Setup tab; the distilled ones need
+# much less memory at a small cost in quality
+SUMMARY_MODELS = [
+    'facebook/bart-large-cnn',
+    'sshleifer/distilbart-cnn-12-6',
+    'sshleifer/distilbart-cnn-6-6',
+]
+DEFAULT_SUMMARY_MODEL = 'facebook/bart-large-cnn'
+
+def load_transformers_summarizer(model_name):
+    """Plain fp32 PyTorch summarization pipeline"""
+    # Imported here because transformers/torch alone take seconds to import
+    from transformers import pipeline
+    return pipeline("summarization", model=model_name)
+
+def load_quantized_summarizer(model_name):
+    """Summarization pipeline with Linear layers dynamically quantized to int8 (CPU only)"""
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("summarization", model=model, tokenizer=tokenizer, device=-1)
+
+def load_onnx_summarizer(model_name, export_dir='onnx_models'):
+    """Summarization pipeline running an ONNX export of the model on ONNX Runtime.
+
+    The export is done once and saved under export_dir. Needs the optional
+    optimum[onnxruntime] package.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError:
+        raise RuntimeError("The ONNX backend needs optimum with ONNX Runtime: pip install optimum[onnxruntime]")
+    from transformers import AutoTokenizer, pipeline
+    model_dir = os.path.join(export_dir, model_name.replace('/', '--'))
+    if os.path.isdir(model_dir):
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_dir)
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    else:
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model.save_pretrained(model_dir)
+        tokenizer.save_pretrained(model_dir)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+# Inference backends selectable for the summarizer; each loader returns a
+# transformers-style summarization pipeline
+SUMMARY_BACKENDS = {
+    'transformers': load_transformers_summarizer,
+    'torch-int8': load_quantized_summarizer,
+    'onnx': load_onnx_summarizer,
+}
+DEFAULT_SUMMARY_BACKEND = 'transformers'
+
+# CV section headings that start the work experience section, and the ones that end it
+EXPERIENCE_HEADINGS = {
+    'experience', 'work experience', 'professional experience', 'employment history',
+    'work history', 'career history', 'relevant experience'
+}
+OTHER_CV_HEADINGS = {
+    'education', 'skills', 'technical skills', 'projects', 'certifications', 'certificates',
+    'languages', 'interests', 'hobbies', 'references', 'awards', 'publications', 'summary',
+    'profile', 'professional summary', 'volunteer experience', 'training'
+}
+
+# Skills and job titles recognised in CVs and job descriptions
+SKILL_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_taxonomy.txt')
+
+def load_skill_taxonomy(path=SKILL_TAXONOMY_PATH):
+    """
+    Read the taxonomy file into {term: display name}.
+    Each line is a term optionally followed by "|"-separated aliases.
+    """
+    terms = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            names = [name.strip() for name in line.split('|') if name.strip()]
+            for name in names:
+                terms.setdefault(name, names[0])
+    return terms
+
+class KeywordMatcher:
+    """Finds all terms of a large vocabulary in one pass over a text (Aho-Corasick).
+
+    Matching ignores case and runs of whitespace and only counts whole
+    words. Every term maps to the name it is reported as, so aliases count
+    towards their main term, and overlapping matches of the same name
+    (e.g. "Rails" inside "Ruby on Rails") are counted once.
+    """
+
+    # Characters that continue a word, so "C" does not match inside "C++"
+    WORD_CHARS = set('_+#')
+
+    def __init__(self, terms):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for term, name in terms.items():
+            pattern = self.normalize(term)
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((len(pattern), name))
+
+        # Breadth-first pass filling in the failure links
+        order = list(self._goto[0].values())
+        for state in order:
+            for char, next_state in self._goto[state].items():
+                order.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    @staticmethod
+    def normalize(text):
+        return re.sub(r'\s+', ' ', text.lower()).strip()
+
+    def is_word_char(self, char):
+        return char.isalnum() or char in self.WORD_CHARS
+
+    def joined(self, text, i, step):
+        """Whether text[i] continues the word next to it (a dot counts inside "node.js")"""
+        if not 0 <= i < len(text):
+            return False
+        if text[i] == '.':
+            return 0 <= i + step < len(text) and self.is_word_char(text[i + step])
+        return self.is_word_char(text[i])
+
+    def count(self, text):
+        """Return {name: occurrences} for every term found in text"""
+        text = self.normalize(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        counts = {}
+        last_end = {}
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            if self.joined(text, i + 1, 1):
+                continue
+            for length, name in out[state]:
+                start = i - length + 1
+                if self.joined(text, start - 1, -1):
+                    continue
+                if last_end.get(name, -1) >= start:
+                    continue
+                last_end[name] = i
+                counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def find(self, text):
+        """Return [(name, occurrences)] sorted by frequency, most frequent first"""
+        return sorted(self.count(text).items(), key=lambda item: item[1], reverse=True)
+
+@functools.lru_cache(maxsize=4)
+def _build_keyword_matcher(path, mtime):
+    return KeywordMatcher(load_skill_taxonomy(path))
+
+def keyword_matcher(path=SKILL_TAXONOMY_PATH):
+    """Matcher for the skill taxonomy; built once and rebuilt only if the file changes"""
+    return _build_keyword_matcher(path, os.path.getmtime(path))
+
+class WebDriverPool:
+    """Pool of warm headless browsers shared by the scrapers.
+
+    Browsers are handed out with acquire() and returned with release(). A
+    browser is health-checked before it is reused and is replaced once it
+    has loaded max_page_loads pages. No more than max_size browsers are
+    alive at any time; acquire() blocks until one is free.
+    """
+
+    def __init__(self, factory, size=2, max_size=4, max_page_loads=50, page_load_timeout=30):
+        self.factory = factory
+        self.size = size
+        self.max_size = max_size
+        self.max_page_loads = max_page_loads
+        self.page_load_timeout = page_load_timeout
+        self._cond = threading.Condition()
+        self._idle = []
+        self._alive = 0
+        self._page_loads = {}
+        self._broken = set()
+        self._closed = False
+
+    def _launch(self):
+        """Start a new browser; the caller must already hold a slot in _alive"""
+        try:
+            driver = self.factory()
+            driver.set_page_load_timeout(self.page_load_timeout)
+        except Exception:
+            with self._cond:
+                self._alive -= 1
+                self._cond.notify()
+            raise
+        self._page_loads[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        """Quit a browser and free its slot"""
+        self._page_loads.pop(id(driver), None)
+        self._broken.discard(id(driver))
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._alive -= 1
+            self._cond.notify()
+
+    def is_healthy(self, driver):
+        """Check that the browser session is still alive and responsive"""
+        if id(driver) in self._broken:
+            return False
+        try:
+            driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
+
+    def warm(self, count=None):
+        """Pre-launch browsers so the first scrapers don't pay the startup cost"""
+        count = self.size if count is None else count
+        for _ in range(count):
+            with self._cond:
+                if self._closed or self._alive >= min(count, self.max_size):
+                    return
+                self._alive += 1
+            try:
+                driver = self._launch()
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Could not pre-launch browser: {str(e)}")
+                return
+            with self._cond:
+                self._idle.append(driver)
+                self._cond.notify()
+
+    def acquire(self):
+        """Take a healthy browser from the pool, launching one if under the cap"""
+        while True:
+            with self._cond:
+                while not self._idle and self._alive >= self.max_size and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    self._alive += 1
+                    driver = None
+            if driver is None:
+                return self._launch()
+            if self.is_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    def release(self, driver, healthy=True):
+        """Return a browser to the pool, recycling it if worn out or broken"""
+        worn_out = self._page_loads.get(id(driver), 0) >= self.max_page_loads
+        if not healthy or worn_out or self._closed or not self.is_healthy(driver):
+            self._discard(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self):
+        """Context manager that acquires a browser and always releases it"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def load(self, driver, url):
+        """Load a page, counting it towards the browser's recycle limit"""
+        self._page_loads[id(driver)] = self._page_loads.get(id(driver), 0) + 1
+        try:
+            driver.get(url)
+        except TimeoutException:
+            # A hung page leaves the session in an unknown state
+            self._broken.add(id(driver))
+            raise
+        except WebDriverException:
+            self._broken.add(id(driver))
+            raise
+
+    def close(self):
+        """Quit all idle browsers; browsers still in use are quit when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+DB_PATH = 'job_applications.db'
+
+def connect_db(path=DB_PATH, timeout=30):
+    """Open the application database in WAL mode with a busy timeout"""
+    conn = sqlite3.connect(path, timeout=timeout)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(f'PRAGMA busy_timeout={int(timeout * 1000)}')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+def add_column_if_missing(conn, table, column, definition):
+    """Add a column to an existing table; returns True if it was added"""
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+    if column in columns:
+        return False
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return True
+
+def init_schema(conn):
+    """Create the application's tables, indexes and triggers, adding the
+    columns missing from databases made by older versions.
+
+    Returns the set of "table.column" names that were added, so the caller
+    can backfill them. The full-text index is made by init_job_search_index().
+    """
+    added = set()
+
+    def add_column(table, column, definition):
+        if add_column_if_missing(conn, table, column, definition):
+            added.add(f'{table}.{column}')
+
+    # Create jobs table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_name TEXT NOT NULL,
+            job_title TEXT NOT NULL,
+            job_description TEXT,
+            email TEXT,
+            url TEXT,
+            location TEXT,
+            salary TEXT,
+            date_found DATE,
+            status TEXT DEFAULT 'Found',
+            applied_date DATE,
+            notes TEXT
+        )
+    ''')
+    
+    # Create email_queue table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS email_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            recipient_email TEXT,
+            subject TEXT,
+            body TEXT,
+            status TEXT DEFAULT 'Pending',
+            created_date DATE,
+            sent_date DATE,
+            FOREIGN KEY (job_id) REFERENCES jobs (id)
+        )
+    ''')
+
+    # Memoized experience summaries, keyed by model, parameters and input
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS summary_cache (
+            key TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            created_at REAL,
+            last_used REAL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_summary_cache_last_used ON summary_cache (last_used)')
+
+    # Newest posting seen per site and query, for incremental searches
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS search_watermarks (
+            site TEXT NOT NULL,
+            keywords TEXT NOT NULL,
+            location TEXT NOT NULL,
+            newest_fingerprint TEXT,
+            last_run DATE,
+            PRIMARY KEY (site, keywords, location)
+        )
+    ''')
+
+    # Normalized-URL fingerprint used to deduplicate postings
+    add_column('jobs', 'url_fingerprint', 'TEXT')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_url_fingerprint ON jobs (url_fingerprint)')
+    # Log of the rows added, changed or deleted in the lists shown in the
+    # GUI, so the views can update just those rows instead of reloading
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS row_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_row_changes_table ON row_changes (table_name, seq)')
+    conn.executescript('''
+        CREATE TRIGGER IF NOT EXISTS jobs_changes_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('jobs', new.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_changes_update
+        AFTER UPDATE OF company_name, job_title, location, email, url, status ON jobs
+        WHEN old.company_name IS NOT new.company_name OR old.job_title IS NOT new.job_title
+            OR old.location IS NOT new.location OR old.email IS NOT new.email
+            OR old.url IS NOT new.url OR old.status IS NOT new.status
+        BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('jobs', new.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_changes_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO row_changes (table_name, row_id, deleted) VALUES ('jobs', old.id, 1);
+        END;
+        CREATE TRIGGER IF NOT EXISTS email_queue_changes_insert AFTER INSERT ON email_queue BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('email_queue', new.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS email_queue_changes_update
+        AFTER UPDATE OF recipient_email, status ON email_queue
+        WHEN old.recipient_email IS NOT new.recipient_email OR old.status IS NOT new.status
+        BEGIN
+            INSERT INTO row_changes (table_name, row_id) VALUES ('email_queue', new.id);
+        END;
+        CREATE TRIGGER IF NOT EXISTS email_queue_changes_delete AFTER DELETE ON email_queue BEGIN
+            INSERT INTO row_changes (table_name, row_id, deleted) VALUES ('email_queue', old.id, 1);
+        END;
+    ''')
+
+    # Default orderings of the paginated job and email lists
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_email_queue_created ON email_queue (COALESCE(created_date, \'\'), id)')
+
+    # Outbox state: Pending -> Sending -> Sent, Failed or Retrying
+    add_column('email_queue', 'attempts', 'INTEGER DEFAULT 0')
+    add_column('email_queue', 'next_attempt', 'TEXT')
+    add_column('email_queue', 'last_error', 'TEXT')
+    add_column('email_queue', 'message_id', 'TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_email_queue_outbox ON email_queue (status, next_attempt)')
+
+    # MinHash signature for near-duplicate detection, the LSH buckets that
+    # index it, and the canonical job a near-duplicate posting belongs to
+    add_column('jobs', 'canonical_id', 'INTEGER REFERENCES jobs (id)')
+    add_column('jobs', 'minhash', 'BLOB')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id INTEGER NOT NULL REFERENCES jobs (id)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_job_lsh_bucket ON job_lsh (band, bucket)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_job_lsh_job ON job_lsh (job_id)')
+
+    # Word counts of every job for TF-IDF ranking, and the last score against the CV
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS terms (
+            id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL UNIQUE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_vectors (
+            job_id INTEGER PRIMARY KEY REFERENCES jobs (id),
+            term_ids BLOB NOT NULL,
+            counts BLOB NOT NULL,
+            version INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_job_vectors_version ON job_vectors (version)')
+    # Last version stamped on job_vectors; kept apart from the rows so that
+    # deleting the newest vector never lets a version number be reused
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS job_vectors_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO job_vectors_version (id, version)
+        SELECT 1, COALESCE(MAX(version), 0) FROM job_vectors
+    ''')
+    add_column('jobs', 'relevance', 'REAL')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_relevance ON jobs (COALESCE(relevance, -1), id)')
+    return added
+
+def init_job_search_index(conn):
+    """Create the FTS5 index over the jobs and the triggers that keep it in sync;
+    returns False when SQLite was built without FTS5"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'"
+    ).fetchone()
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                job_title, company_name, location, job_description,
+                content='jobs', content_rowid='id', tokenize='porter unicode61', prefix='2 3'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5; the search box is disabled
+        logging.getLogger(__name__).warning(f"Full-text search unavailable: {str(e)}")
+        return False
+    conn.executescript('''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, job_title, company_name, location, job_description)
+            VALUES (new.id, new.job_title, new.company_name, new.location, new.job_description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, job_title, company_name, location, job_description)
+            VALUES ('delete', old.id, old.job_title, old.company_name, old.location, old.job_description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+        AFTER UPDATE OF job_title, company_name, location, job_description ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, job_title, company_name, location, job_description)
+            VALUES ('delete', old.id, old.job_title, old.company_name, old.location, old.job_description);
+            INSERT INTO jobs_fts (rowid, job_title, company_name, location, job_description)
+            VALUES (new.id, new.job_title, new.company_name, new.location, new.job_description);
+        END;
+    ''')
+    if not exists:
+        # Index the jobs stored before the search index existed
+        conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+    return True
+
+# Query parameters that only track the visitor and never identify a posting
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref', 'refid', 'from', 'tk', 'vjs', 'advn', 'adid', 'sid', 'ved', 'src'}
+
+def normalize_url(url):
+    """Canonical form of a job URL: https, lower-case host without www,
+    no fragment, no trailing slash and only non-tracking query params, sorted"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    host = host.removesuffix(':443').removesuffix(':80')
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+def job_fingerprint(job):
+    """Stable identity of a posting: its normalized URL, or company/title/location when it has none"""
+    if job.get('fingerprint'):
+        return job['fingerprint']
+    if job.get('url'):
+        key = 'url:' + normalize_url(job['url'])
+    else:
+        key = 'job:' + '|'.join(' '.join(str(job.get(field) or '').lower().split()) for field in ('company', 'title', 'location'))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+# MinHash signatures for cross-site near-duplicate detection. The 32 hashes
+# are split into 8 LSH bands of 4; postings sharing a band become candidates
+# (catching pairs with Jaccard similarity above roughly 0.6), and candidates
+# count as duplicates when at least NEAR_DUPLICATE_SIMILARITY of their
+# hashes agree.
+MINHASH_PERMUTATIONS = 32
+MINHASH_BANDS = 8
+NEAR_DUPLICATE_SIMILARITY = 0.7
+NEAR_DUPLICATE_TITLE_SIMILARITY = 0.6
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_SEEDS = [
+    (random.Random(seed).randrange(1, _MINHASH_PRIME), random.Random(-seed).randrange(0, _MINHASH_PRIME))
+    for seed in range(1, MINHASH_PERMUTATIONS + 1)
+]
+COMPANY_SUFFIXES = {'inc', 'ltd', 'llc', 'limited', 'co', 'corp', 'corporation', 'plc', 'gmbh', 'group'}
+TITLE_ABBREVIATIONS = {'sr': 'senior', 'jr': 'junior', 'dev': 'developer', 'eng': 'engineer', 'mgr': 'manager'}
+# Words boards add to a title that say how the role is worked, not what it is
+TITLE_NOISE_WORDS = {'remote', 'hybrid', 'onsite', 'contract', 'permanent', 'temporary', 'full', 'part', 'time',
+                     'm', 'f', 'd', 'w'}
+
+def _words(text):
+    return re.findall(r'[a-z0-9+#]+', (text or '').lower())
+
+def job_shingles(job):
+    """Normalized features of a posting: description word 3-shingles plus title and company words"""
+    words = _words(job.get('description'))
+    shingles = {' '.join(words[i:i + 3]) for i in range(len(words) - 2)}
+    shingles.update('title:' + TITLE_ABBREVIATIONS.get(word, word) for word in _words(job.get('title')))
+    shingles.update('company:' + word for word in _words(job.get('company')) if word not in COMPANY_SUFFIXES)
+    return shingles
+
+def job_role(title, company):
+    """Normalized title words and company of a posting, for comparing with same_role()"""
+    title_words = frozenset(
+        TITLE_ABBREVIATIONS.get(word, word) for word in _words(title) if word not in TITLE_NOISE_WORDS
+    )
+    company_words = ' '.join(word for word in _words(company) if word not in COMPANY_SUFFIXES)
+    return title_words, company_words
+
+def same_role(first, second):
+    """Whether two job_role()s can be the same role: the same company and
+    mostly the same title words, so a repost titled "... (Remote)" matches
+    but different roles at one company sharing boilerplate do not"""
+    (first_title, first_company), (second_title, second_company) = first, second
+    if first_company != second_company:
+        return False
+    union = first_title | second_title
+    if not union:
+        return True
+    return len(first_title & second_title) / len(union) >= NEAR_DUPLICATE_TITLE_SIMILARITY
+
+def job_minhash(job):
+    """MinHash signature of a posting packed as bytes, or None when there is
+    too little description to compare reliably"""
+    shingles = job_shingles(job)
+    if len(shingles) < 20:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big') for s in shingles]
+    signature = [min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in _MINHASH_SEEDS]
+    return struct.pack(f'>{MINHASH_PERMUTATIONS}Q', *signature)
+
+def minhash_buckets(signature):
+    """LSH bucket of each band of a packed MinHash signature"""
+    rows = len(signature) // MINHASH_BANDS
+    buckets = []
+    for band in range(MINHASH_BANDS):
+        digest = hashlib.blake2b(signature[band * rows:(band + 1) * rows], digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+def minhash_similarity(first, second):
+    """Estimated Jaccard similarity of two packed MinHash signatures"""
+    a = struct.unpack(f'>{MINHASH_PERMUTATIONS}Q', first)
+    b = struct.unpack(f'>{MINHASH_PERMUTATIONS}Q', second)
+    return sum(x == y for x, y in zip(a, b)) / MINHASH_PERMUTATIONS
+
+def link_near_duplicates(conn, job_ids):
+    """Index the signatures of the given jobs and link each near-duplicate to its canonical job.
+
+    Candidates come from the LSH bucket index, so each job is only compared
+    with postings that share a band instead of the whole table, and only
+    those that are the same role by same_role() are linked. Jobs that are
+    already indexed are left alone.
+    """
+    linked = 0
+    for job_id in sorted(job_ids):
+        row = conn.execute('SELECT minhash, job_title, company_name FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if not row or row[0] is None:
+            continue
+        if conn.execute('SELECT 1 FROM job_lsh WHERE job_id = ? LIMIT 1', (job_id,)).fetchone():
+            continue
+        signature = row[0]
+        role = job_role(row[1], row[2])
+        buckets = minhash_buckets(signature)
+        conditions = ' OR '.join('(l.band = ? AND l.bucket = ?)' for _ in buckets)
+        params = [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        candidates = conn.execute(f'''
+            SELECT DISTINCT j.id, j.minhash, j.canonical_id, j.job_title, j.company_name FROM job_lsh l
+            JOIN jobs j ON j.id = l.job_id
+            WHERE ({conditions}) AND l.job_id < ?
+            ORDER BY j.id
+        ''', (*params, job_id)).fetchall()
+        for candidate_id, candidate_signature, candidate_canonical, title, company in candidates:
+            if not same_role(job_role(title, company), role):
+                continue
+            if minhash_similarity(signature, candidate_signature) >= NEAR_DUPLICATE_SIMILARITY:
+                conn.execute('UPDATE jobs SET canonical_id = ? WHERE id = ?', (candidate_canonical or candidate_id, job_id))
+                linked += 1
+                break
+        conn.executemany(
+            'INSERT INTO job_lsh (band, bucket, job_id) VALUES (?, ?, ?)',
+            [(band, bucket, job_id) for band, bucket in enumerate(buckets)]
+        )
+    return linked
+
+# Words too common in job postings and CVs to say anything about fit
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'we', 'will', 'with',
+    'you', 'your', 'who', 'what', 'which', 'can', 'all', 'any', 'not', 'but', 'if', 'so', 'up',
+    'was', 'were', 'been', 'they', 'them', 'us', 'i', 'my', 'me', 'he', 'she', 'also', 'more'
+}
+
+def term_counts(text):
+    """Return {word: count} of the words in text that are used for relevance ranking"""
+    counts = {}
+    for word in _words(text):
+        if len(word) < 2 or word in STOP_WORDS or word.isdigit():
+            continue
+        counts[word] = counts.get(word, 0) + 1
+    return counts
+
+def index_job_terms(conn, job_ids):
+    """Store the word counts of the given jobs for relevance ranking.
+
+    Each job gets one row in job_vectors holding its term ids and counts as
+    packed int32 arrays. Rows are stamped with a version that grows with
+    every call, so readers can pick up only what changed; jobs whose
+    counts did not change keep their row.
+    """
+    job_ids = sorted(job_ids)
+    counts = {}
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        placeholders = ', '.join('?' * len(chunk))
+        for job_id, title, description in conn.execute(
+            f'SELECT id, job_title, job_description FROM jobs WHERE id IN ({placeholders})', chunk
+        ):
+            counts[job_id] = term_counts(f"{title}\n{description or ''}")
+
+    words = sorted(set().union(*counts.values())) if counts else []
+    conn.executemany('INSERT OR IGNORE INTO terms (term) VALUES (?)', [(word,) for word in words])
+    term_ids = {}
+    existing = {}
+    for start in range(0, len(words), 500):
+        chunk = words[start:start + 500]
+        placeholders = ', '.join('?' * len(chunk))
+        term_ids.update(conn.execute(f'SELECT term, id FROM terms WHERE term IN ({placeholders})', chunk))
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        placeholders = ', '.join('?' * len(chunk))
+        existing.update(
+            (job_id, (terms, tfs)) for job_id, terms, tfs in
+            conn.execute(f'SELECT job_id, term_ids, counts FROM job_vectors WHERE job_id IN ({placeholders})', chunk)
+        )
+
+    conn.execute('UPDATE job_vectors_version SET version = version + 1 WHERE id = 1')
+    version = conn.execute('SELECT version FROM job_vectors_version WHERE id = 1').fetchone()[0]
+    rows = []
+    for job_id, job_counts in counts.items():
+        pairs = sorted((term_ids[word], tf) for word, tf in job_counts.items())
+        terms = np.array([term_id for term_id, _ in pairs], dtype=np.int32).tobytes()
+        tfs = np.array([tf for _, tf in pairs], dtype=np.int32).tobytes()
+        if existing.get(job_id) != (terms, tfs):
+            rows.append((job_id, terms, tfs, version))
+    conn.executemany(
+        'INSERT OR REPLACE INTO job_vectors (job_id, term_ids, counts, version) VALUES (?, ?, ?, ?)', rows
+    )
+
+class RelevanceIndex:
+    """In-memory sparse TF-IDF matrix of the stored jobs, for ranking them against a CV.
+
+    The word counts live in the job_vectors table, which JobWriter keeps up
+    to date. refresh() only reads the vectors written since the last call,
+    and a re-indexed job replaces its earlier entries. Weights are
+    sublinear tf times idf and each job's vector is L2-normalized, so
+    score() is one cosine-similarity pass over the non-zero entries.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.term_ids = {}
+        self._version = 0
+        self._jobs = np.zeros(0, dtype=np.int64)
+        self._terms = np.zeros(0, dtype=np.int64)
+        self._tf = np.zeros(0, dtype=np.float64)
+        self._weights = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Load the job vectors written since the last refresh"""
+        conn = connect_db(self.db_path)
+        try:
+            with self._lock:
+                max_term_id = max(self.term_ids.values(), default=0)
+                self.term_ids.update(
+                    (term, term_id) for term_id, term in
+                    conn.execute('SELECT id, term FROM terms WHERE id > ?', (max_term_id,))
+                )
+                rows = conn.execute(
+                    'SELECT job_id, term_ids, counts, version FROM job_vectors WHERE version > ?',
+                    (self._version,)
+                ).fetchall()
+                if not rows:
+                    return
+                self._version = max(row[3] for row in rows)
+                job_ids = np.array([row[0] for row in rows], dtype=np.int64)
+                terms = [np.frombuffer(row[1], dtype=np.int32) for row in rows]
+                tfs = [np.frombuffer(row[2], dtype=np.int32) for row in rows]
+                # Entries of re-indexed jobs are replaced by their new vectors
+                keep = ~np.isin(self._jobs, job_ids)
+                self._jobs = np.concatenate([self._jobs[keep], np.repeat(job_ids, [len(t) for t in terms])])
+                self._terms = np.concatenate([self._terms[keep]] + [t.astype(np.int64) for t in terms])
+                self._tf = np.concatenate([self._tf[keep]] + [t.astype(np.float64) for t in tfs])
+                self._weights = None
+        finally:
+            conn.close()
+
+    def _compute_weights(self):
+        """Cache idf, the unit-length job weights and the job id of every row"""
+        job_ids, rows = np.unique(self._jobs, return_inverse=True)
+        # Rows may name terms added after term_ids was read
+        vocabulary = max(int(self._terms.max()), max(self.term_ids.values(), default=0)) + 1
+        df = np.bincount(self._terms, minlength=vocabulary)
+        idf = np.log((1 + len(job_ids)) / (1 + df)) + 1
+        weights = (1 + np.log(self._tf)) * idf[self._terms]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(job_ids)))
+        weights /= np.where(norms > 0, norms, 1)[rows]
+        self._weights = (job_ids, rows, idf, weights)
+
+    def score(self, text):
+        """Return (job_ids, scores) with the cosine similarity of every job to text"""
+        with self._lock:
+            if not len(self._jobs):
+                return np.zeros(0, dtype=np.int64), np.zeros(0)
+            if self._weights is None:
+                self._compute_weights()
+            job_ids, rows, idf, weights = self._weights
+            query = np.zeros(len(idf))
+            for term, tf in term_counts(text).items():
+                term_id = self.term_ids.get(term)
+                if term_id is not None and term_id < len(idf):
+                    query[term_id] = (1 + np.log(tf)) * idf[term_id]
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                return job_ids, np.zeros(len(job_ids))
+            scores = np.bincount(rows, weights=weights * query[self._terms], minlength=len(job_ids)) / norm
+            return job_ids, scores
+
+    def remove(self, job_ids):
+        """Drop deleted jobs from the index"""
+        with self._lock:
+            keep = ~np.isin(self._jobs, np.asarray(job_ids, dtype=np.int64))
+            if keep.all():
+                return
+            self._jobs = self._jobs[keep]
+            self._terms = self._terms[keep]
+            self._tf = self._tf[keep]
+            self._weights = None
+
+def store_relevance(conn, job_ids, scores):
+    """Write relevance scores, touching only the jobs whose rounded score changed.
+
+    Jobs missing from job_ids lose their score. Returns the number of rows updated.
+    """
+    scores = dict(zip(job_ids.tolist(), scores.round(4).tolist()))
+    updates = [
+        (scores.get(job_id), job_id)
+        for job_id, relevance in conn.execute('SELECT id, relevance FROM jobs')
+        if scores.get(job_id) != relevance
+    ]
+    if updates:
+        with conn:
+            conn.executemany('UPDATE jobs SET relevance = ? WHERE id = ?', updates)
+    return len(updates)
+
+EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+
+def fts_query(text):
+    """
+    Turn a search box entry into an FTS5 query.
+    Words must all match, "quoted text" is a phrase, a trailing * matches a
+    prefix and OR / NOT work between terms. Everything else is quoted so
+    punctuation cannot break the query.
+    """
+    parts = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text):
+        if phrase.strip():
+            parts.append('"' + phrase.replace('"', '') + '"')
+        elif word in ('OR', 'NOT'):
+            if parts and parts[-1] not in ('OR', 'NOT'):
+                parts.append(word)
+        elif word:
+            prefix = word.endswith('*')
+            word = re.sub(r'[^\w+#.-]', '', word.rstrip('*'))
+            if word:
+                parts.append('"' + word + '"' + ('*' if prefix else ''))
+    while parts and parts[-1] in ('OR', 'NOT'):
+        parts.pop()
+    return ' '.join(parts)
+
+class SiteThrottle:
+    """Politeness limit for one job site.
+
+    Caps how many requests run against the site at once and spaces out
+    their start times by a random delay.
+    """
+
+    def __init__(self, max_concurrent=2, delay=(0.5, 1.0)):
+        self.delay = delay
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    @contextmanager
+    def slot(self):
+        """Wait for a free slot and for this request's turn to start"""
+        with self._slots:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(self._next_start, now) + random.uniform(*self.delay)
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+class DetailPipeline:
+    """Staged scraping pipeline: listing pages -> detail workers -> save.
+
+    Listing scrapers queue job stubs with submit(). A pool of detail workers
+    loads each job's own page via fetch_details and then passes the finished
+    job to save. Stubs submitted without detail selectors go straight to
+    save. join() waits until everything queued so far has been handled.
+    """
+
+    def __init__(self, fetch_details, save, workers=4, should_stop=None):
+        self.fetch_details = fetch_details
+        self.save = save
+        self.workers = workers
+        self.should_stop = should_stop or (lambda: False)
+        self.saved_count = 0
+        self._queue = queue.Queue()
+        self._threads = []
+        self._count_lock = threading.Lock()
+
+    def start(self):
+        """Start the detail worker threads"""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"detail-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, job, site, detail_selectors=None):
+        """Queue a job stub from a listing page"""
+        self._queue.put((job, site, detail_selectors))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            job, site, detail_selectors = item
+            try:
+                # Once the search is stopped, remaining stubs are dropped
+                if not self.should_stop():
+                    if detail_selectors and job['url']:
+                        self.fetch_details(job, site, detail_selectors)
+                    self.save(job, site)
+                    with self._count_lock:
+                        self.saved_count += 1
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Error processing {site} job: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """Wait until every queued job has been processed"""
+        self._queue.join()
+
+    def close(self):
+        """Stop the worker threads once the queue is drained"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+# Seconds a cached page stays fresh, per site: (listing pages, detail pages)
+PAGE_CACHE_TTLS = {
+    'Indeed': (1800, 86400),
+    'Glassdoor': (1800, 86400),
+    'CareerBuilder': (3600, 86400),
+    'BrighterMonday': (3600, 86400),
+    'Remote OK': (900, 86400),
+    'We Work Remotely': (900, 86400),
+}
+DEFAULT_PAGE_CACHE_TTLS = (3600, 86400)
+
+class PageCache:
+    """Persistent cache of fetched pages, keyed by URL.
+
+    Each entry is one gzip-compressed JSON file under cache_dir holding the
+    body, the time it was fetched and any ETag/Last-Modified validators, so
+    stale entries can be revalidated with a conditional request.
+    """
+
+    def __init__(self, cache_dir='page_cache'):
+        self.cache_dir = cache_dir
+
+    def _path(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + '.json.gz')
+
+    def get(self, url):
+        """Return the cached entry for a URL, fresh or not, or None"""
+        try:
+            with gzip.open(self._path(url), 'rt', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def get_fresh(self, url, ttl):
+        """Return the cached body if it is younger than ttl seconds"""
+        entry = self.get(url)
+        if entry and time.time() - entry['fetched_at'] < ttl:
+            return entry['body']
+        return None
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Store a page; the file is replaced atomically so readers never see a partial entry"""
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            'url': url,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time()
+        }
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as file:
+                file.write(json.dumps(entry).encode('utf-8'))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Could not cache {url}: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def prune(self, max_age=7 * 86400):
+        """Delete entries that have not been refreshed for max_age seconds"""
+        cutoff = time.time() - max_age
+        for directory, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+def is_json(text):
+    """True if text is a valid JSON document"""
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+class HttpFetcher:
+    """Keep-alive HTTP client that scrapers try before falling back to a browser.
+
+    fetch() returns the page body, or None when the response is a block page
+    or a JavaScript shell without the expected content. Hosts that keep
+    failing over plain HTTP are sent straight to the browser for the rest of
+    the session. With a PageCache, responses are stored and revalidated
+    instead of downloaded again.
+    """
+
+    BLOCK_STATUSES = {401, 403, 429, 503}
+    BLOCK_MARKERS = (
+        'captcha', 'cf-challenge', 'just a moment...', 'access denied',
+        'are you a robot', 'unusual traffic', 'verify you are human'
+    )
+
+    def __init__(self, pool_size=10, timeout=15, max_misses=2, cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.max_misses = max_misses
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': get_random_user_agent(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9'
+        })
+        self._misses = {}
+        self._lock = threading.Lock()
+
+    def _record(self, host, ok):
+        with self._lock:
+            self._misses[host] = 0 if ok else self._misses.get(host, 0) + 1
+
+    def browser_only(self, url):
+        """True once a host has failed over plain HTTP too many times in a row"""
+        return self._misses.get(urlparse(url).netloc, 0) >= self.max_misses
+
+    def is_block_page(self, html):
+        """Detect anti-bot pages by their content"""
+        head = html[:5000].lower()
+        return any(marker in head for marker in self.BLOCK_MARKERS)
+
+    def looks_blocked(self, response):
+        """Detect anti-bot responses"""
+        return response.status_code in self.BLOCK_STATUSES or self.is_block_page(response.text)
+
+    def get_text(self, url, ttl=0, headers=None, validate=None):
+        """GET a page body through the pooled session; returns None on failure.
+
+        With a cache and a ttl, a fresh cached copy is returned without any
+        request, and a stale one is revalidated with If-None-Match /
+        If-Modified-Since so an unchanged page costs only a 304. validate(body),
+        if given, must accept a body before it is returned; only accepted
+        bodies are cached.
+        """
+        entry = self.cache.get(url) if self.cache and ttl else None
+        if entry and time.time() - entry['fetched_at'] < ttl:
+            if validate is None or validate(entry['body']):
+                return entry['body']
+            entry = None
+        if self.browser_only(url):
+            return None
+        headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        host = urlparse(url).netloc
+        try:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+        except requests.RequestException as e:
+            logging.getLogger(__name__).info(f"HTTP fetch failed for {url}: {str(e)}")
+            self._record(host, False)
+            return None
+        if response.status_code == 304 and entry:
+            body, etag, last_modified = entry['body'], entry.get('etag'), entry.get('last_modified')
+        elif not response.ok or self.looks_blocked(response):
+            self._record(host, False)
+            return None
+        else:
+            body, etag, last_modified = response.text, response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if validate is not None and not validate(body):
+            self._record(host, False)
+            return None
+        self._record(host, True)
+        if self.cache and ttl:
+            self.cache.put(url, body, etag, last_modified)
+        return body
+
+    def fetch(self, url, expect_selector=None, ttl=0):
+        """Return the HTML of a page if it can be used without a browser"""
+        # Content missing from the raw HTML means it is rendered by JavaScript
+        validate = None
+        if expect_selector:
+            validate = lambda html: BeautifulSoup(html, 'lxml').select_one(expect_selector) is not None
+        return self.get_text(url, ttl, validate=validate)
+
+    def fetch_json(self, url, ttl=0):
+        """Return a decoded JSON document, or None"""
+        body = self.get_text(url, ttl, headers={'Accept': 'application/json'}, validate=is_json)
+        return json.loads(body) if body is not None else None
+
+class JobWriter:
+    """Single background thread that owns all inserts into the jobs table.
+
+    Scrapers hand jobs over with put(). Rows are written with executemany in
+    one transaction per batch, once batch_size rows are waiting or
+    flush_interval seconds after the first row of the batch arrived.
+    flush() waits until everything queued so far is committed, and close()
+    writes whatever is left before the thread exits.
+    """
+
+    def __init__(self, db_path=DB_PATH, batch_size=100, flush_interval=1.0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="job-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, job):
+        """Queue a job for the next batch"""
+        self._queue.put((
+            job['company'],
+            job['title'],
+            job['description'],
+            job['email'],
+            job['url'],
+            job['location'],
+            job.get('salary', ''),
+            datetime.now().strftime('%Y-%m-%d'),
+            job_fingerprint(job),
+            job_minhash(job)
+        ))
+
+    def flush(self):
+        """Block until every job queued so far has been committed"""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Write any pending jobs and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _write(self, conn, batch):
+        if not batch:
+            return
+        try:
+            with conn:
+                # A posting seen before only fills in details that were missing
+                conn.executemany('''
+                    INSERT INTO jobs (company_name, job_title, job_description, email, url, location, salary, date_found,
+                                      url_fingerprint, minhash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(url_fingerprint) DO UPDATE SET
+                        job_description = COALESCE(NULLIF(excluded.job_description, ''), jobs.job_description),
+                        email = COALESCE(NULLIF(jobs.email, ''), excluded.email),
+                        salary = COALESCE(NULLIF(excluded.salary, ''), jobs.salary),
+                        minhash = COALESCE(jobs.minhash, excluded.minhash)
+                ''', batch)
+                fingerprints = [row[8] for row in batch]
+                placeholders = ', '.join('?' * len(fingerprints))
+                job_ids = [row[0] for row in conn.execute(
+                    f'SELECT id FROM jobs WHERE url_fingerprint IN ({placeholders})', fingerprints
+                )]
+                link_near_duplicates(conn, job_ids)
+                index_job_terms(conn, job_ids)
+        except sqlite3.Error as e:
+            logging.getLogger(__name__).error(f"Error saving {len(batch)} jobs to database: {str(e)}")
+        batch.clear()
+
+    def _run(self):
+        conn = connect_db(self.db_path)
+        batch = []
+        deadline = None
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(conn, batch)
+                continue
+            if item is None:
+                self._write(conn, batch)
+                break
+            if isinstance(item, threading.Event):
+                self._write(conn, batch)
+                item.set()
+                continue
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(conn, batch)
+        conn.close()
+
+class SummaryCache:
+    """Persistent memo of model summaries, stored in the application database.
+
+    Entries are keyed by a SHA-256 of the model name, the generation
+    parameters and the input text, so a change to any of them misses. Once
+    the table holds more than max_entries rows the least recently used ones
+    are evicted. Hits and misses are counted to report the hit rate.
+    """
+
+    def __init__(self, db_path=DB_PATH, max_entries=5000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_name, params, text):
+        """Cache key of one summarization call"""
+        payload = json.dumps([model_name, params, text], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys):
+        """Return {key: summary} for the keys that are cached, marking them as used"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        conn = connect_db(self.db_path)
+        try:
+            with conn:
+                # Stay well below SQLite's limit on bound parameters
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ', '.join('?' * len(chunk))
+                    found.update(conn.execute(
+                        f'SELECT key, summary FROM summary_cache WHERE key IN ({placeholders})', chunk
+                    ).fetchall())
+                conn.executemany(
+                    'UPDATE summary_cache SET last_used = ? WHERE key = ?',
+                    [(time.time(), key) for key in found]
+                )
+        finally:
+            conn.close()
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store (key, summary) pairs and evict the least recently used overflow"""
+        if not items:
+            return
+        now = time.time()
+        conn = connect_db(self.db_path)
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO summary_cache (key, summary, created_at, last_used) VALUES (?, ?, ?, ?)',
+                    [(key, summary, now, now) for key, summary in items]
+                )
+                conn.execute('''
+                    DELETE FROM summary_cache WHERE key IN (
+                        SELECT key FROM summary_cache ORDER BY last_used ASC
+                        LIMIT MAX(0, (SELECT COUNT(*) FROM summary_cache) - ?)
+                    )
+                ''', (self.max_entries,))
+        finally:
+            conn.close()
+
+    def hit_rate(self):
+        """Share of lookups this session that were answered from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class ExperienceSummarizer:
+    """Map-reduce summarization of CV experience with a loaded pipeline.
+
+    Each text is split into chunks that fit the model's input, every unique
+    chunk across all texts is summarized in one batched pass, and the chunk
+    summaries of a text are summarized again until a single summary remains.
+    Chunks shared by several texts are summarized once and reused through
+    the persistent cache. Runs inside the summarizer process.
+    """
+
+    def __init__(self, pipeline, name, cache, params, batch_size=8, max_reduce_rounds=3):
+        self.pipeline = pipeline
+        self.name = name
+        self.cache = cache
+        self.params = params
+        self.batch_size = batch_size
+        self.max_reduce_rounds = max_reduce_rounds
+
+    def summarize(self, texts, on_progress=None, should_stop=None):
+        """Return one summary per text, or None if should_stop() turned true.
+
+        on_progress(done, total) counts chunks across all rounds; total grows
+        as reduce rounds turn out to be needed, done never goes back.
+        """
+        results = {text: "" for text in texts if not text.strip()}
+        unique = list(dict.fromkeys(text for text in texts if text.strip()))
+        if self.pipeline is None:
+            results.update({text: text[:300] for text in unique})  # fallback: first 300 chars
+            return [results[text] for text in texts]
+
+        tokenizer = self.pipeline.tokenizer
+        max_tokens = self.input_tokens(tokenizer)
+        current = {text: text for text in unique}
+        done = 0
+        for round_index in range(self.max_reduce_rounds):
+            if not current:
+                break
+            chunked = {text: self.chunk(body, tokenizer, max_tokens) for text, body in current.items()}
+            # Every text still made of several chunks adds at least one to the next round
+            upcoming = 0
+            if round_index + 1 < self.max_reduce_rounds:
+                upcoming = sum(1 for chunks in chunked.values() if len(chunks) > 1)
+            round_total = [0]
+
+            def round_progress(round_done, total, offset=done, upcoming=upcoming):
+                round_total[0] = total
+                on_progress(offset + round_done, offset + total + upcoming)
+
+            summaries = self.summarize_chunks(
+                [chunk for chunks in chunked.values() for chunk in chunks], max_tokens,
+                round_progress if on_progress else None, should_stop
+            )
+            if summaries is None:
+                return None
+            done += round_total[0]
+            reduced = {}
+            for text, chunks in chunked.items():
+                if len(chunks) <= 1:
+                    results[text] = summaries[chunks[0]] if chunks else ""
+                else:
+                    reduced[text] = "\n".join(summaries[chunk] for chunk in chunks)
+            current = reduced
+        # Anything still too long after the last round keeps its first summary
+        for text, body in current.items():
+            results[text] = body.split("\n")[0]
+        if on_progress and done:
+            on_progress(done, done)
+        return [results[text] for text in texts]
+
+    def input_tokens(self, tokenizer):
+        """Token budget of one model input, leaving room for special tokens"""
+        return min(tokenizer.model_max_length, 1024) - 2
+
+    def chunk(self, text, tokenizer, max_tokens):
+        """
+        Split text into line-aligned chunks of at most max_tokens model tokens.
+        A single line longer than the budget is cut at token boundaries.
+        """
+        chunks = []
+        current = []
+        current_tokens = 0
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            ids = tokenizer.encode(line, add_special_tokens=False)
+            if current and current_tokens + len(ids) + 1 > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            if len(ids) > max_tokens:
+                for start in range(0, len(ids), max_tokens):
+                    chunks.append(tokenizer.decode(ids[start:start + max_tokens]))
+                continue
+            current.append(line)
+            current_tokens += len(ids) + 1
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def summarize_chunks(self, chunks, max_tokens, on_progress=None, should_stop=None):
+        """
+        Summarize chunks with batched inference; returns {chunk: summary}.
+
+        Identical chunks are summarized once and earlier summaries are read
+        from the persistent cache. If a batch fails, its chunks are retried
+        one by one, and a chunk that still fails falls back to its first 300
+        characters (fallbacks are not cached). Returns None if should_stop()
+        turns true between batches; summaries made so far are still cached.
+        """
+        unique = list(dict.fromkeys(chunks))
+        params = dict(self.params, max_input_tokens=max_tokens)
+        keys = {chunk: SummaryCache.key(self.name, params, chunk) for chunk in unique}
+        cached = self.cache.get_many(keys.values())
+        summaries = {chunk: cached[keys[chunk]] for chunk in unique if keys[chunk] in cached}
+        pending = [chunk for chunk in unique if chunk not in summaries]
+
+        generated = []
+        batch_size = max(1, self.batch_size)
+        try:
+            for start in range(0, len(pending), batch_size):
+                if should_stop and should_stop():
+                    return None
+                if on_progress:
+                    on_progress(start, len(pending))
+                batch = pending[start:start + batch_size]
+                try:
+                    results = self.pipeline(batch, batch_size=len(batch), truncation=True, **self.params)
+                    for chunk, result in zip(batch, results):
+                        summaries[chunk] = result['summary_text']
+                        generated.append((keys[chunk], result['summary_text']))
+                except Exception:
+                    for chunk in batch:
+                        try:
+                            summaries[chunk] = self.pipeline(chunk, truncation=True, **self.params)[0]['summary_text']
+                            generated.append((keys[chunk], summaries[chunk]))
+                        except Exception:
+                            summaries[chunk] = chunk[:300]  # fallback: first 300 chars
+        finally:
+            self.cache.put_many(generated)
+        if on_progress and pending:
+            on_progress(len(pending), len(pending))
+        return summaries
+
+def summarizer_worker(model_name, backend, name, db_path, requests_queue, responses, cancel):
+    """Entry point of the summarizer process.
+
+    Loads the model, then answers ('summarize', ...) requests until it is
+    sent ('stop',). Everything it reports goes back through responses as
+    ('state', state, error), ('progress', id, done, total),
+    ('done', id, summaries, hits, misses), ('cancelled', id) or
+    ('error', id, message), and finally ('stopped',).
+    """
+    responses.put(('state', 'loading', None))
+    try:
+        if backend not in SUMMARY_BACKENDS:
+            raise ValueError(f"Unknown summarization backend: {backend}")
+        pipeline = SUMMARY_BACKENDS[backend](model_name)
+        responses.put(('state', 'ready', None))
+    except Exception as e:
+        # Keep serving requests so callers get the plain-text fallback
+        pipeline = None
+        responses.put(('state', 'failed', str(e)))
+
+    cache = SummaryCache(db_path)
+    while True:
+        request = requests_queue.get()
+        if request[0] == 'stop':
+            break
+        _, request_id, texts, params, batch_size, max_reduce_rounds = request
+        summarizer = ExperienceSummarizer(pipeline, name, cache, params, batch_size, max_reduce_rounds)
+        hits, misses = cache.hits, cache.misses
+        try:
+            summaries = summarizer.summarize(
+                texts,
+                on_progress=lambda done, total: responses.put(('progress', request_id, done, total)),
+                should_stop=cancel.is_set
+            )
+        except Exception as e:
+            responses.put(('error', request_id, str(e)))
+            continue
+        if summaries is None:
+            responses.put(('cancelled', request_id))
+        else:
+            responses.put(('done', request_id, summaries, cache.hits - hits, cache.misses - misses))
+    responses.put(('stopped',))
+
+class SummarizerProcess:
+    """Summarization model hosted in a separate worker process.
+
+    The GUI never runs inference itself: submit() queues a request and
+    returns a Future that is resolved from a listener thread, with progress
+    reported through a callback and cancel() stopping the running request
+    between batches. The process (and the model's memory) is shut down
+    after idle_timeout seconds without work and started again on the next
+    request. on_state_change is called with the summarizer and 'loading',
+    'ready', 'failed' or 'released'.
+    """
+
+    def __init__(self, model_name=DEFAULT_SUMMARY_MODEL, backend=DEFAULT_SUMMARY_BACKEND,
+                 on_state_change=None, db_path=DB_PATH, idle_timeout=300):
+        self.model_name = model_name
+        self.backend = backend
+        self.on_state_change = on_state_change
+        self.db_path = db_path
+        self.idle_timeout = idle_timeout
+        self.state = 'not loaded'
+        self.error = None
+        self._lock = threading.Lock()
+        self._process = None
+        self._requests = None
+        self._cancel = None
+        self._pending = {}
+        self._next_id = 0
+        self._last_used = time.time()
+        self._closed = False
+
+    @property
+    def name(self):
+        """Identifies the model and backend, e.g. for cache keys"""
+        if self.backend == DEFAULT_SUMMARY_BACKEND:
+            return self.model_name
+        return f"{self.model_name}@{self.backend}"
+
+    def _set_state(self, state, error=None):
+        self.state = state
+        self.error = error
+        if self.on_state_change:
+            self.on_state_change(self, state)
+
+    def _start(self):
+        """Start the worker process if it is not running (caller holds the lock)"""
+        if self._process is not None and self._process.is_alive():
+            return
+        # spawn gives the worker a clean interpreter instead of a fork of the Tk process
+        ctx = multiprocessing.get_context('spawn')
+        self._requests = ctx.Queue()
+        self._cancel = ctx.Event()
+        responses = ctx.Queue()
+        self._process = ctx.Process(
+            target=summarizer_worker,
+            args=(self.model_name, self.backend, self.name, self.db_path, self._requests, responses, self._cancel),
+            name="summarizer",
+            daemon=True
+        )
+        self._process.start()
+        self._last_used = time.time()
+        threading.Thread(target=self._listen, args=(self._process, responses),
+                         name="summarizer-listener", daemon=True).start()
+
+    def _stop(self):
+        """Ask the worker process to exit (caller holds the lock)"""
+        if self._process is not None:
+            self._requests.put(('stop',))
+            self._process = None
+
+    def _listen(self, process, responses):
+        """Dispatch the worker's messages until it stops"""
+        while True:
+            try:
+                message = responses.get(timeout=1)
+            except queue.Empty:
+                if not process.is_alive():
+                    self._fail_pending(RuntimeError("Summarizer process exited unexpectedly"))
+                    with self._lock:
+                        crashed = self._process is process
+                        if crashed:
+                            self._process = None
+                    if crashed:
+                        self._set_state('failed', f"process exited with code {process.exitcode}")
+                    return
+                self._release_if_idle(process)
+                continue
+
+            kind = message[0]
+            if kind == 'stopped':
+                process.join(timeout=5)
+                with self._lock:
+                    released = self._process is None and not self._closed
+                if released:
+                    self._set_state('released')
+                return
+            if kind == 'state':
+                self._set_state(message[1], message[2])
+                continue
+
+            request_id = message[1]
+            with self._lock:
+                if kind == 'progress':
+                    future, on_progress = self._pending.get(request_id, (None, None))
+                else:
+                    future, on_progress = self._pending.pop(request_id, (None, None))
+                    self._last_used = time.time()
+            if future is None:
+                continue
+            if kind == 'progress':
+                if on_progress:
+                    on_progress(message[2], message[3])
+            elif kind == 'done':
+                future.set_result(message[2:])
+            elif kind == 'cancelled':
+                future.cancel()
+            else:
+                future.set_exception(RuntimeError(message[2]))
+
+    def _release_if_idle(self, process):
+        with self._lock:
+            if (self._process is process and not self._pending
+                    and time.time() - self._last_used > self.idle_timeout):
+                logging.getLogger(__name__).info(f"Releasing idle summarization model {self.name}")
+                self._stop()
+
+    def _fail_pending(self, error):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, _ in pending.values():
+            future.set_exception(error)
+
+    def load_async(self):
+        """Start the worker process (and model load) if it is not running"""
+        with self._lock:
+            if not self._closed:
+                self._start()
+
+    def submit(self, texts, params, batch_size=8, max_reduce_rounds=3, on_progress=None):
+        """
+        Queue texts for summarization and return a Future.
+
+        The Future resolves to (summaries, cache_hits, cache_misses) and is
+        cancelled if cancel() is called before the request finishes.
+        on_progress(done, total) is called from the listener thread.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Summarizer has been closed")
+            self._start()
+            self._next_id += 1
+            self._pending[self._next_id] = (future, on_progress)
+            self._last_used = time.time()
+            self._cancel.clear()
+            self._requests.put(('summarize', self._next_id, list(texts), params, batch_size, max_reduce_rounds))
+        return future
+
+    def cancel(self):
+        """Stop the running request at the next batch boundary"""
+        with self._lock:
+            if self._cancel is not None:
+                self._cancel.set()
+
+    def close(self):
+        """Stop the worker process and fail anything still pending"""
+        with self._lock:
+            self._closed = True
+            process = self._process
+            self._stop()
+        self._fail_pending(RuntimeError("Summarizer has been closed"))
+        if process is not None:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+# Serialization used for outgoing mail, as smtplib.send_message does
+SMTP_POLICY = compat32.clone(linesep='\r\n')
+
+class AttachmentCache:
+    """Serialized attachment parts, keyed by path, mtime and size.
+
+    Each file is read, base64-encoded and rendered as a complete MIME part
+    once; messages splice the cached bytes in, so building one only costs
+    its headers and body. A file that has changed on disk is encoded again.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def part_bytes(self, path):
+        """Return the serialized attachment part of a file, building it if not cached"""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == key:
+                return entry[1]
+        part = MIMEBase('application', 'octet-stream')
+        with open(path, 'rb') as attachment:
+            part.set_payload(attachment.read())
+        encoders.encode_base64(part)
+        part.add_header(
+            'Content-Disposition',
+            f'attachment; filename= {os.path.basename(path)}'
+        )
+        data = part.as_bytes(policy=SMTP_POLICY)
+        with self._lock:
+            self._entries[path] = (key, data)
+        return data
+
+class PreparedEmail:
+    """A serialized message with its envelope, ready for SMTP.sendmail"""
+
+    def __init__(self, from_addr, to_addrs, data):
+        self.from_addr = from_addr
+        self.to_addrs = to_addrs
+        self.data = data
+
+def build_email_message(sender, recipient_email, subject, body, message_id, attachments, attachment_cache):
+    """Build an application email; attachments are paths, None entries are skipped.
+
+    Only the headers and body are serialized here; the cached attachment
+    parts are spliced in before the closing boundary.
+    """
+    boundary = f"{'=' * 15}{random.getrandbits(64):020d}=="
+    msg = MIMEMultipart(boundary=boundary)
+    msg['From'] = sender
+    msg['To'] = recipient_email
+    msg['Subject'] = subject
+    msg['Message-ID'] = message_id
+    
+    # Add body
+    msg.attach(MIMEText(body, 'plain'))
+    data = msg.as_bytes(policy=SMTP_POLICY)
+    
+    # Add CV and cover letter attachments, encoded once and reused
+    delimiter = f'\r\n--{boundary}'.encode('ascii')
+    closing = data.rindex(delimiter + b'--')
+    parts = [data[:closing]]
+    for path in attachments:
+        if path:
+            parts += [delimiter, b'\r\n', attachment_cache.part_bytes(path)]
+    parts.append(data[closing:])
+    return PreparedEmail(parseaddr(sender)[1], [recipient_email], b''.join(parts))
+
+class TokenBucket:
+    """Rate limiter allowing rate operations per second with bursts of up to capacity.
+
+    Tokens refill continuously; acquire() takes one, waiting for it if the
+    bucket is empty.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, should_stop=None):
+        """Take a token; returns False if should_stop() turned true while waiting"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if should_stop and should_stop():
+                return False
+            time.sleep(min(wait, 0.5))
+
+class SMTPDeliveryUncertain(smtplib.SMTPException):
+    """The session failed after the message data was sent, so the server may have accepted it"""
+
+class PooledSMTP(smtplib.SMTP):
+    """SMTP connection that remembers whether the current message reached the DATA stage"""
+
+    data_started = False
+
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+
+class SmtpPool:
+    """Small pool of logged-in connections to one SMTP server.
+
+    Connections are opened on demand, up to size of them, and reused for
+    later messages. A connection the server has dropped is discarded and
+    send() retries the message once on a fresh one, but only if the session
+    failed before the message data was sent. starttls=False skips
+    the TLS upgrade, for local test servers only.
+    """
+
+    def __init__(self, host, port, username, password, size=2, timeout=30, starttls=True):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self.starttls = starttls
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        server = PooledSMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def acquire(self):
+        """Return an idle connection or open a new one (blocks while size are in use)"""
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, server, healthy=True):
+        if healthy:
+            with self._lock:
+                self._idle.append(server)
+        else:
+            try:
+                server.close()
+            except Exception:
+                pass
+        self._slots.release()
+
+    def send(self, msg):
+        """Send a PreparedEmail, reconnecting once if the session was dropped before DATA.
+
+        Raises SMTPDeliveryUncertain if the session fails once the message
+        data has started, since resending could deliver it twice.
+        """
+        for attempt in range(2):
+            server = self.acquire()
+            server.data_started = False
+            try:
+                server.sendmail(msg.from_addr, msg.to_addrs, msg.data)
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError) as e:
+                self.release(server, healthy=False)
+                if server.data_started:
+                    raise SMTPDeliveryUncertain(
+                        f"Connection lost after the message was sent; it may have been delivered ({str(e)})"
+                    ) from e
+                if attempt:
+                    raise
+                logging.getLogger(__name__).info(f"SMTP session dropped ({str(e)}), reconnecting")
+                continue
+            except smtplib.SMTPResponseException as e:
+                # 421: the server is closing this session
+                self.release(server, healthy=e.smtp_code != 421)
+                raise
+            except Exception:
+                self.release(server, healthy=False)
+                raise
+            self.release(server)
+            return
+
+    def close(self):
+        """Log out of every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server in idle:
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+def is_transient_smtp_error(error):
+    """True for failures worth retrying: 4xx replies, and sessions dropped or
+    timed out before the message was sent"""
+    if isinstance(error, SMTPDeliveryUncertain):
+        return False
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError))
+
+class EmailSender:
+    """Sends queued emails from background threads through a durable outbox.
+
+    Each email moves Pending -> Sending -> Sent, Failed or Retrying, and
+    every state change is committed before the next step, so a crash never
+    loses track of a message. An email is only sent after it has been
+    claimed by moving it to Sending, which succeeds for one worker and one
+    run only. Failures before the message data was sent that look
+    transient are retried with exponential backoff up to max_attempts; a
+    session lost after that may have delivered the message, so it is marked
+    Failed rather than retried.
+
+    A feeder thread claims due emails chunk_size at a time, so an
+    interrupted run can be resumed with only the unsent emails. Workers,
+    one per pooled SMTP connection, build each message with
+    build_message(recipient, subject, body, message_id), wait for the
+    token bucket and send it. on_progress(sent, failed, total) is called
+    after every settled message and on_done(sent, failed, cancelled) once
+    the run is over; both run on sender threads.
+    """
+
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+    def __init__(self, pool, bucket, build_message, db_path=DB_PATH, on_progress=None, on_done=None,
+                 chunk_size=50, max_attempts=5, retry_delay=30, max_retry_delay=900):
+        self.pool = pool
+        self.bucket = bucket
+        self.build_message = build_message
+        self.db_path = db_path
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.chunk_size = chunk_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.sent = 0
+        self.failed = 0
+        self.total = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def start(self, email_ids=None):
+        """Send the given emails, or every Pending and Retrying one when email_ids is None"""
+        threading.Thread(target=self._feed, args=(email_ids,), name="email-sender", daemon=True).start()
+
+    def cancel(self):
+        """Stop after the messages currently being sent; the rest stay queued"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _now(self):
+        return datetime.now().strftime(self.DATE_FORMAT)
+
+    def _feed(self, email_ids):
+        conn = connect_db(self.db_path)
+        workers = [
+            threading.Thread(target=self._run, name=f"email-sender-{i}", daemon=True)
+            for i in range(self.pool.size)
+        ]
+        try:
+            scope = ''
+            if email_ids is not None:
+                conn.execute('CREATE TEMP TABLE send_scope (id INTEGER PRIMARY KEY)')
+                conn.executemany('INSERT OR IGNORE INTO send_scope VALUES (?)', [(int(i),) for i in email_ids])
+                scope = ' AND id IN (SELECT id FROM temp.send_scope)'
+            self.total = conn.execute(
+                f"SELECT COUNT(*) FROM email_queue WHERE status IN ('Pending', 'Retrying'){scope}"
+            ).fetchone()[0]
+            for worker in workers:
+                worker.start()
+
+            while not self.cancelled:
+                chunk = conn.execute(f'''
+                    SELECT id FROM email_queue
+                    WHERE (status = 'Pending' OR (status = 'Retrying' AND next_attempt <= ?)){scope}
+                    ORDER BY id LIMIT ?
+                ''', (self._now(), self.chunk_size)).fetchall()
+                if chunk:
+                    for (email_id,) in chunk:
+                        self._queue.put(email_id)
+                    self._queue.join()
+                    continue
+                # Nothing due; wait for the earliest retry, if any is left
+                next_attempt = conn.execute(
+                    f"SELECT MIN(next_attempt) FROM email_queue WHERE status = 'Retrying'{scope}"
+                ).fetchone()[0]
+                if next_attempt is None:
+                    break
+                wait = (datetime.strptime(next_attempt, self.DATE_FORMAT) - datetime.now()).total_seconds()
+                self._cancelled.wait(min(max(wait, 0.5), 5))
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Email sender stopped: {str(e)}")
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    self._queue.put(None)
+            for worker in workers:
+                worker.join()
+            conn.close()
+            self.pool.close()
+        if self.on_done:
+            self.on_done(self.sent, self.failed, self.cancelled)
+
+    def _run(self):
+        conn = connect_db(self.db_path)
+        # Outbox states must survive a power cut as well as a crash
+        conn.execute('PRAGMA synchronous=FULL')
+        try:
+            while True:
+                email_id = self._queue.get()
+                try:
+                    if email_id is None:
+                        return
+                    if self.cancelled or not self.bucket.acquire(should_stop=lambda: self.cancelled):
+                        continue
+                    self._deliver(conn, email_id)
+                except Exception as e:
+                    logging.getLogger(__name__).error(f"Error processing email {email_id}: {str(e)}")
+                finally:
+                    self._queue.task_done()
+        finally:
+            conn.close()
+
+    def _claim(self, conn, email_id):
+        """Move a due email to Sending; returns its row, or None if it is not ours to send"""
+        with conn:
+            claimed = conn.execute('''
+                UPDATE email_queue
+                SET status = 'Sending', attempts = COALESCE(attempts, 0) + 1,
+                    message_id = COALESCE(message_id, ?)
+                WHERE id = ? AND (status = 'Pending' OR (status = 'Retrying' AND next_attempt <= ?))
+            ''', (make_msgid(), email_id, self._now())).rowcount
+        if not claimed:
+            return None
+        return conn.execute('''
+            SELECT job_id, recipient_email, subject, body, message_id, attempts
+            FROM email_queue WHERE id = ?
+        ''', (email_id,)).fetchone()
+
+    def _deliver(self, conn, email_id):
+        row = self._claim(conn, email_id)
+        if row is None:
+            return
+        job_id, recipient_email, subject, body, message_id, attempts = row
+        try:
+            self.pool.send(self.build_message(recipient_email, subject, body, message_id))
+        except Exception as e:
+            self._record_failure(conn, email_id, attempts, e)
+        else:
+            with conn:
+                conn.execute('''
+                    UPDATE email_queue 
+                    SET status = 'Sent', sent_date = ?, next_attempt = NULL, last_error = NULL
+                    WHERE id = ? AND status = 'Sending'
+                ''', (self._now(), email_id))
+                conn.execute('''
+                    UPDATE jobs 
+                    SET status = "Applied", applied_date = ?
+                    WHERE id = ?
+                ''', (datetime.now().strftime('%Y-%m-%d'), job_id))
+            with self._lock:
+                self.sent += 1
+        if self.on_progress:
+            self.on_progress(self.sent, self.failed, self.total)
+
+    def _record_failure(self, conn, email_id, attempts, error):
+        """Schedule a retry for a transient failure, otherwise mark the email Failed"""
+        logger = logging.getLogger(__name__)
+        if is_transient_smtp_error(error) and attempts < self.max_attempts:
+            delay = min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+            next_attempt = (datetime.now() + timedelta(seconds=delay)).strftime(self.DATE_FORMAT)
+            logger.warning(f"Email {email_id} attempt {attempts} failed ({str(error)}), retrying at {next_attempt}")
+            with conn:
+                conn.execute('''
+                    UPDATE email_queue SET status = 'Retrying', next_attempt = ?, last_error = ?
+                    WHERE id = ? AND status = 'Sending'
+                ''', (next_attempt, str(error), email_id))
+            return
+        logger.error(f"Error sending email {email_id}: {str(error)}")
+        with conn:
+            conn.execute('''
+                UPDATE email_queue SET status = 'Failed', next_attempt = NULL, last_error = ?
+                WHERE id = ? AND status = 'Sending'
+            ''', (str(error), email_id))
+        with self._lock:
+            self.failed += 1
+
+class LogBuffer:
+    """Thread-safe buffer of log messages waiting to be shown in the GUI.
+
+    Worker threads append() without touching Tk; the UI thread drains the
+    whole buffer on a timer and inserts it in one go. At most max_pending
+    messages are held; older ones are dropped and counted if the UI falls
+    behind.
+    """
+
+    def __init__(self, max_pending=5000):
+        self._messages = deque()
+        self._lock = threading.Lock()
+        self.max_pending = max_pending
+        self.dropped = 0
+
+    def append(self, message):
+        with self._lock:
+            if len(self._messages) >= self.max_pending:
+                self._messages.popleft()
+                self.dropped += 1
+            self._messages.append(message)
+
+    def drain(self):
+        """Return everything appended since the last drain as one string"""
+        with self._lock:
+            if not self._messages and not self.dropped:
+                return ''
+            messages, self._messages = self._messages, deque()
+            dropped, self.dropped = self.dropped, 0
+        text = ''.join(messages)
+        if dropped:
+            text = f"[{dropped} earlier messages skipped]\n" + text
+        return text
+
+class PagedTreeview:
+    """Fills a Treeview from SQL one page at a time (keyset pagination).
+
+    load() sets the FROM/WHERE of the query and fetches the first page; the
+    next page is fetched when the view is scrolled near its end. Pages are
+    ordered by (sort key, id) and each one continues after the last row
+    shown, so the cost of a page does not grow with the table. Clicking a
+    column heading sorts by that column in SQL. Items carry the row id as
+    their iid and first tag.
+
+    sync() brings the loaded rows up to date without reloading: it reads
+    the row_changes entries of changes_table made since the last load or
+    sync and inserts, updates, moves or removes only those items, so the
+    selection and scroll position are kept.
+    """
+
+    def __init__(self, tree, scrollbar, conn, id_column, columns, sort_keys, format_row,
+                 changes_table, page_size=200, descending_first=()):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.conn = conn
+        self.id_column = id_column
+        self.columns = columns
+        self.sort_keys = sort_keys
+        self.format_row = format_row
+        self.page_size = page_size
+        self.descending_first = set(descending_first)
+        self.changes_table = changes_table
+        self.headings = {column: tree.heading(column, 'text') for column in tree['columns']}
+        self.source = None
+        self.where = ''
+        self.params = ()
+        self.sort = None
+        self.descending = False
+        self._last_key = None
+        self._has_more = False
+        self._loading = False
+        self._seq = 0
+        # (sort key, id) of every loaded item, ascending, and by iid
+        self._ordered = []
+        self._keys = {}
+        tree.configure(yscrollcommand=self._on_scroll)
+        for column in tree['columns']:
+            if column in sort_keys:
+                tree.heading(column, command=lambda column=column: self.sort_by(column))
+
+    def load(self, source, where='', params=(), sort=None, descending=None):
+        """Show the first page of the rows of source matching where"""
+        self.source = source
+        self.where = where
+        self.params = tuple(params)
+        if sort is not None:
+            self.sort = sort
+            self.descending = sort in self.descending_first if descending is None else descending
+        self.tree.delete(*self.tree.get_children())
+        self._ordered = []
+        self._keys = {}
+        self._last_key = None
+        self._has_more = True
+        self._seq = self.conn.execute('SELECT COALESCE(MAX(seq), 0) FROM row_changes').fetchone()[0]
+        self.load_more()
+        self._prune_changes()
+
+    def sort_by(self, column):
+        """Sort by a column; clicking the same column again reverses the order"""
+        if self.source is None:
+            return
+        descending = not self.descending if column == self.sort else column in self.descending_first
+        self.load(self.source, self.where, self.params, column, descending)
+
+    def _query(self, row_ids=None):
+        sort_expr = self.sort_keys[self.sort]
+        direction = 'DESC' if self.descending else 'ASC'
+        conditions = [self.where] if self.where else []
+        params = list(self.params)
+        if row_ids is not None:
+            conditions.append(f"{self.id_column} IN ({', '.join('?' * len(row_ids))})")
+            params.extend(row_ids)
+        elif self._last_key is not None:
+            # The bound on the sort key alone lets SQLite seek in an index on it
+            op = '<' if self.descending else '>'
+            conditions.append(f"{sort_expr} {op}= ? AND ({sort_expr}, {self.id_column}) {op} (?, ?)")
+            params.extend((self._last_key[0],) + self._last_key)
+        where = f"WHERE {' AND '.join(f'({c})' for c in conditions)}" if conditions else ''
+        sql = f'''
+            SELECT {sort_expr}, {self.id_column}, {', '.join(self.columns)}
+            FROM {self.source} {where}
+            ORDER BY {sort_expr} {direction}, {self.id_column} {direction}
+            LIMIT ?
+        '''
+        return sql, params + [self.page_size if row_ids is None else len(row_ids)]
+
+    def load_more(self):
+        """Append the next page of rows"""
+        if not self._has_more or self._loading:
+            return
+        self._loading = True
+        try:
+            sql, params = self._query()
+            rows = self.conn.execute(sql, params).fetchall()
+        finally:
+            self._loading = False
+        for row in rows:
+            # A row whose sort key changed since an earlier page may come round again
+            if not self.tree.exists(str(row[1])):
+                self.tree.insert('', 'end', iid=str(row[1]), values=self.format_row(row[2:]), tags=(row[1],))
+                self._remember(str(row[1]), (row[0], row[1]))
+        if rows:
+            self._last_key = (rows[-1][0], rows[-1][1])
+        self._has_more = len(rows) == self.page_size
+        self._update_headings()
+
+    def sync(self):
+        """Apply the rows changed since the last load or sync"""
+        if self.source is None:
+            return
+        changes = self.conn.execute(
+            'SELECT seq, row_id, deleted FROM row_changes WHERE table_name = ? AND seq > ? ORDER BY seq',
+            (self.changes_table, self._seq)
+        ).fetchall()
+        if not changes:
+            return
+        self._seq = changes[-1][0]
+        latest = {}
+        for _, row_id, deleted in changes:
+            latest[row_id] = deleted
+        changed = [row_id for row_id, deleted in latest.items() if not deleted]
+
+        rows = []
+        for start in range(0, len(changed), 500):
+            sql, params = self._query(changed[start:start + 500])
+            rows.extend(self.conn.execute(sql, params).fetchall())
+        current = {str(row[1]): row for row in rows}
+        for row_id in latest:
+            iid = str(row_id)
+            if iid in current:
+                self._place(current[iid])
+            elif self.tree.exists(iid):
+                # Deleted, or no longer matches the filter
+                self._forget(iid)
+                self.tree.delete(iid)
+        self._prune_changes()
+
+    def _place(self, row):
+        """Insert, update or move the item of a changed row"""
+        iid = str(row[1])
+        key = (row[0], row[1])
+        values = self.format_row(row[2:])
+        exists = self.tree.exists(iid)
+        # Rows past the loaded window arrive with a later page
+        past_window = self._has_more and self._last_key is not None and (
+            key < self._last_key if self.descending else key > self._last_key
+        )
+        if past_window:
+            if exists:
+                self._forget(iid)
+                self.tree.delete(iid)
+            return
+        if exists and self._keys.get(iid) == key:
+            self.tree.item(iid, values=values)
+            return
+        if exists:
+            self._forget(iid)
+        index = bisect.bisect_left(self._ordered, key)
+        position = len(self._ordered) - index if self.descending else index
+        if exists:
+            self.tree.item(iid, values=values)
+            self.tree.move(iid, '', position)
+        else:
+            self.tree.insert('', position, iid=iid, values=values, tags=(row[1],))
+        self._remember(iid, key)
+
+    def _remember(self, iid, key):
+        self._keys[iid] = key
+        bisect.insort(self._ordered, key)
+
+    def _forget(self, iid):
+        key = self._keys.pop(iid, None)
+        if key is not None:
+            index = bisect.bisect_left(self._ordered, key)
+            if index < len(self._ordered) and self._ordered[index] == key:
+                del self._ordered[index]
+
+    def _prune_changes(self):
+        """Drop the change entries this view has already applied"""
+        self.conn.execute('DELETE FROM row_changes WHERE table_name = ? AND seq <= ?', (self.changes_table, self._seq))
+        self.conn.commit()
+
+    def _update_headings(self):
+        for column, text in self.headings.items():
+            if column == self.sort:
+                text += ' ▼' if self.descending else ' ▲'
+            self.tree.heading(column, text=text)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Fetch the next page before the user reaches the end of the loaded rows
+        if self._has_more and float(last) > 0.9:
+            self.tree.after_idle(self.load_more)
 
 class JobSearchApp:
     def __init__(self, root):
@@ -47,12 +2394,68 @@ class JobSearchApp:
         self.last_search_keywords = None
         self.last_search_location = None
         self.last_site_index = 0
+        self.completed_sites = set()
+        self.stop_search_flag = False
+        self.search_thread = None
+
+        # Number of job boards scraped in parallel
+        self.max_search_workers = 4
+
+        # Number of threads loading job detail pages, and per-site request limit
+        self.detail_workers = 4
+        self.max_requests_per_site = 2
+        self.site_throttles = {}
+        self.site_throttles_lock = threading.Lock()
+
+        # Incremental mode stops paging once this share of a page is already stored
+        self.incremental_search = False
+        self.incremental_known_ratio = 0.8
+
+        # Fingerprints of stored jobs, loaded when a search starts
+        self.known_fingerprints = set()
+        self.known_fingerprints_lock = threading.Lock()
 
-        # Initialize Model
-        self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+        # Shared headless browsers, capped so memory stays bounded
+        self.max_browsers = 4
+        self.driver_pool = WebDriverPool(self.get_edge_driver, size=2, max_size=self.max_browsers, max_page_loads=50)
+
+        # Fetched pages are kept on disk so reruns can skip the network
+        self.page_cache = PageCache()
+
+        # Plain HTTP is tried first; the browser is only used as a fallback
+        self.http = HttpFetcher(pool_size=self.detail_workers + self.max_search_workers, cache=self.page_cache)
+
+        # Summarization model, hosted in its own process so inference never
+        # blocks the GUI; started once the window is up, released when idle
+        self.summarizer = SummarizerProcess(
+            os.getenv('SUMMARY_MODEL', DEFAULT_SUMMARY_MODEL),
+            os.getenv('SUMMARY_BACKEND', DEFAULT_SUMMARY_BACKEND),
+            on_state_change=self.on_model_state_change
+        )
+        self.generation_future = None
+        # Number of experience texts summarized per inference call
+        self.summary_batch_size = 8
+        self.summary_params = {'max_length': 80, 'min_length': 30, 'do_sample': False}
+        # Chunk summaries of a long CV are reduced at most this many times
+        self.max_reduce_rounds = 3
+
+        # Background sender of the current email run, if any
+        self.email_sender = None
+        # Encoded CV and cover letter, shared by every message sent
+        self.attachment_cache = AttachmentCache()
         
         # Initialize database
         self.init_database()
+
+        # Scraped jobs are written in batches by a single writer thread
+        self.job_writer = JobWriter()
+
+        # TF-IDF vectors of the stored jobs, for ranking them against the CV
+        self.relevance_index = RelevanceIndex()
+        # Background ranking run, callbacks waiting for it and whether it must run again
+        self.rank_thread = None
+        self.rank_callbacks = []
+        self.rank_again = False
         
         # CV content
         self.cv_content = ""
@@ -70,47 +2473,77 @@ class JobSearchApp:
         # Job search keywords (extracted from CV)
         self.search_keywords = []
         
+        # Search log lines are buffered and shown on a timer, keeping at most max_log_lines
+        self.search_log = LogBuffer()
+        self.log_interval_ms = 100
+        self.max_log_lines = 2000
+
         self.create_widgets()
+        self.root.after(self.log_interval_ms, self.drain_search_log)
+
+        # Warm the model only after the first frame has been drawn
+        self.root.after(500, self.summarizer.load_async)
         
     def init_database(self):
         """Initialize SQLite database"""
-        self.conn = sqlite3.connect('job_applications.db')
+        self.conn = connect_db()
         self.cursor = self.conn.cursor()
-        
-        # Create jobs table
+        added = init_schema(self.conn)
+        self.fts_available = init_job_search_index(self.conn)
+
+        # Fill in the columns added to a database made by an older version
+        if 'jobs.url_fingerprint' in added:
+            self.backfill_fingerprints()
+        if 'jobs.minhash' in added:
+            self.backfill_signatures()
+        if 'jobs.relevance' in added:
+            self.cursor.execute('SELECT id FROM jobs')
+            index_job_terms(self.conn, [row[0] for row in self.cursor.fetchall()])
+        self.unlink_different_roles()
+
+        # An email left in Sending by a crash may or may not have gone out;
+        # it is not resent automatically
         self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company_name TEXT NOT NULL,
-                job_title TEXT NOT NULL,
-                job_description TEXT,
-                email TEXT,
-                url TEXT,
-                location TEXT,
-                salary TEXT,
-                date_found DATE,
-                status TEXT DEFAULT 'Found',
-                applied_date DATE,
-                notes TEXT
-            )
+            UPDATE email_queue SET status = 'Failed', last_error = 'Interrupted while sending; it may have been delivered'
+            WHERE status = 'Sending'
         ''')
-        
-        # Create email_queue table
+
+        self.conn.commit()
+
+    def unlink_different_roles(self):
+        """Clear near-duplicate links between jobs that are not the same role"""
         self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS email_queue (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_id INTEGER,
-                recipient_email TEXT,
-                subject TEXT,
-                body TEXT,
-                status TEXT DEFAULT 'Pending',
-                created_date DATE,
-                sent_date DATE,
-                FOREIGN KEY (job_id) REFERENCES jobs (id)
-            )
+            SELECT d.id, d.job_title, d.company_name, c.job_title, c.company_name
+            FROM jobs d JOIN jobs c ON c.id = d.canonical_id
         ''')
-        
-        self.conn.commit()
+        unlinked = [
+            (job_id,) for job_id, title, company, canonical_title, canonical_company in self.cursor.fetchall()
+            if not same_role(job_role(title, company), job_role(canonical_title, canonical_company))
+        ]
+        self.cursor.executemany('UPDATE jobs SET canonical_id = NULL WHERE id = ?', unlinked)
+
+    def backfill_signatures(self):
+        """Sign jobs stored before near-duplicate detection and link their duplicates"""
+        self.cursor.execute('SELECT id, company_name, job_title, job_description FROM jobs')
+        updates = []
+        for job_id, company, title, description in self.cursor.fetchall():
+            signature = job_minhash({'company': company, 'title': title, 'description': description})
+            if signature:
+                updates.append((signature, job_id))
+        self.cursor.executemany('UPDATE jobs SET minhash = ? WHERE id = ?', updates)
+        link_near_duplicates(self.conn, [job_id for _, job_id in updates])
+
+    def backfill_fingerprints(self):
+        """Fingerprint jobs stored before deduplication; later duplicates are left without one"""
+        seen = set()
+        updates = []
+        self.cursor.execute('SELECT id, company_name, job_title, url, location FROM jobs ORDER BY id')
+        for job_id, company, title, url, location in self.cursor.fetchall():
+            fingerprint = job_fingerprint({'company': company, 'title': title, 'url': url, 'location': location})
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                updates.append((fingerprint, job_id))
+        self.cursor.executemany('UPDATE jobs SET url_fingerprint = ? WHERE id = ?', updates)
         
     def create_widgets(self):
         """Create main GUI widgets"""
@@ -163,6 +2596,27 @@ class JobSearchApp:
         # Extract Keywords Button
         ttk.Button(content_frame, text="Extract Keywords for Job Search", 
                   command=self.extract_keywords).pack(pady=5)
+
+        # Summarization Model
+        model_frame = ttk.LabelFrame(self.setup_tab, text="Summarization Model", padding="10")
+        model_frame.pack(fill='x', padx=10, pady=5)
+
+        self.model_var = tk.StringVar(value=self.summarizer.model_name)
+        model_combo = ttk.Combobox(model_frame, textvariable=self.model_var, values=SUMMARY_MODELS, width=40)
+        model_combo.pack(side='left', padx=5)
+        model_combo.bind('<<ComboboxSelected>>', self.change_summary_model)
+        self.backend_var = tk.StringVar(value=self.summarizer.backend)
+        backend_combo = ttk.Combobox(model_frame, textvariable=self.backend_var, values=list(SUMMARY_BACKENDS),
+                                     state='readonly', width=12)
+        backend_combo.pack(side='left', padx=5)
+        backend_combo.bind('<<ComboboxSelected>>', self.change_summary_model)
+        self.model_status_label = ttk.Label(model_frame, text="Model: not loaded")
+        self.model_status_label.pack(side='left', padx=10)
+
+        ttk.Label(model_frame, text="Batch size:").pack(side='left', padx=5)
+        self.batch_size_var = tk.IntVar(value=self.summary_batch_size)
+        ttk.Spinbox(model_frame, from_=1, to=64, width=5, textvariable=self.batch_size_var,
+                    command=self.change_summary_batch_size).pack(side='left', padx=5)
         
     def create_search_tab(self):
         """Create job search tab widgets"""
@@ -202,6 +2656,9 @@ class JobSearchApp:
                   command=self.start_job_search).pack(side='left', padx=5)
         ttk.Button(controls_frame, text="Stop Search", 
                   command=self.stop_job_search).pack(side='left', padx=5)
+        self.incremental_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(controls_frame, text="Incremental (stop at known postings)",
+                        variable=self.incremental_var).pack(side='left', padx=5)
         
         # Progress Bar
         self.progress = ttk.Progressbar(params_frame, mode='indeterminate')
@@ -222,16 +2679,43 @@ class JobSearchApp:
         
         ttk.Button(controls_frame, text="Refresh", command=self.refresh_jobs).pack(side='left', padx=5)
         ttk.Button(controls_frame, text="Delete Selected", command=self.delete_selected_job).pack(side='left', padx=5)
-        ttk.Button(controls_frame, text="Generate Applications", command=self.generate_applications).pack(side='left', padx=5)
+        self.generate_button = ttk.Button(controls_frame, text="Generate Applications", command=self.generate_applications)
+        self.generate_button.pack(side='left', padx=5)
+        self.cancel_generation_button = ttk.Button(controls_frame, text="Cancel", state='disabled',
+                                                   command=self.cancel_generation)
+        self.cancel_generation_button.pack(side='left', padx=5)
+        self.generation_progress = ttk.Progressbar(controls_frame, mode='determinate', length=200)
+        self.generation_progress.pack(side='left', padx=5)
+        self.generation_label = ttk.Label(controls_frame, text="")
+        self.generation_label.pack(side='left', padx=5)
+        ttk.Label(controls_frame, text="Top N (0 = all):").pack(side='left', padx=5)
+        self.top_n_var = tk.IntVar(value=0)
+        ttk.Spinbox(controls_frame, from_=0, to=10000, width=6, textvariable=self.top_n_var).pack(side='left', padx=5)
+        ttk.Button(controls_frame, text="Rank by CV", command=self.rank_jobs).pack(side='left', padx=5)
+
+        # Full-text search
+        search_frame = ttk.Frame(self.jobs_tab)
+        search_frame.pack(fill='x', padx=10, pady=5)
+
+        ttk.Label(search_frame, text="Search:").pack(side='left', padx=5)
+        self.job_search_entry = ttk.Entry(search_frame, width=60)
+        self.job_search_entry.pack(side='left', padx=5)
+        self.job_search_entry.bind('<Return>', lambda event: self.refresh_jobs())
+        ttk.Button(search_frame, text="Search", command=self.refresh_jobs).pack(side='left', padx=5)
+        ttk.Button(search_frame, text="Clear", command=self.clear_job_search).pack(side='left', padx=5)
+        ttk.Label(search_frame, text='e.g. remote laravel docker, "full stack", develop*').pack(side='left', padx=5)
+        if not self.fts_available:
+            self.job_search_entry.config(state='disabled')
         
         # Jobs Treeview
         tree_frame = ttk.Frame(self.jobs_tab)
         tree_frame.pack(fill='both', expand=True, padx=10, pady=5)
         
         # Create treeview with scrollbars
-        self.jobs_tree = ttk.Treeview(tree_frame, columns=('Company', 'Job Title', 'Location', 'Email', 'URL', 'Status'), show='headings')
+        self.jobs_tree = ttk.Treeview(tree_frame, columns=('Relevance', 'Company', 'Job Title', 'Location', 'Email', 'URL', 'Status'), show='headings')
         
         # Configure columns
+        self.jobs_tree.heading('Relevance', text='Relevance')
         self.jobs_tree.heading('Company', text='Company')
         self.jobs_tree.heading('Job Title', text='Job Title')
         self.jobs_tree.heading('Location', text='Location')
@@ -239,6 +2723,7 @@ class JobSearchApp:
         self.jobs_tree.heading('URL', text='URL')
         self.jobs_tree.heading('Status', text='Status')
 
+        self.jobs_tree.column('Relevance', width=80)
         self.jobs_tree.column('Company', width=200)
         self.jobs_tree.column('Job Title', width=250)
         self.jobs_tree.column('Location', width=150)
@@ -249,7 +2734,28 @@ class JobSearchApp:
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.jobs_tree.yview)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient='horizontal', command=self.jobs_tree.xview)
-        self.jobs_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.jobs_tree.configure(xscrollcommand=h_scrollbar.set)
+
+        # Rows are loaded a page at a time as the list is scrolled
+        self.jobs_pager = PagedTreeview(
+            self.jobs_tree, v_scrollbar, self.conn,
+            id_column='jobs.id',
+            columns=['jobs.relevance', 'jobs.company_name', 'jobs.job_title', 'jobs.location',
+                     'jobs.email', 'jobs.url', 'jobs.status'],
+            sort_keys={
+                'Relevance': 'COALESCE(jobs.relevance, -1)',
+                'Company': 'jobs.company_name',
+                'Job Title': 'jobs.job_title',
+                'Location': "COALESCE(jobs.location, '')",
+                'Email': "COALESCE(jobs.email, '')",
+                'URL': "COALESCE(jobs.url, '')",
+                'Status': "COALESCE(jobs.status, '')",
+                'Match': 'bm25(jobs_fts, 10.0, 5.0, 3.0, 1.0)',
+            },
+            format_row=lambda row: (f"{row[0]:.2f}" if row[0] is not None else '',) + tuple(row[1:]),
+            changes_table='jobs',
+            descending_first=('Relevance',)
+        )
         
         # Pack treeview and scrollbars
         self.jobs_tree.pack(side='left', fill='both', expand=True)
@@ -296,6 +2802,14 @@ class JobSearchApp:
         self.sender_name_entry.grid(row=2, column=1, padx=5, pady=2)
         self.sender_name_entry.insert(0, "Peter Kangichu")
         
+        ttk.Label(settings_frame, text="Emails per minute:").grid(row=2, column=2, sticky='w', padx=5)
+        self.email_rate_var = tk.IntVar(value=60)
+        ttk.Spinbox(settings_frame, from_=1, to=600, width=8, textvariable=self.email_rate_var).grid(row=2, column=3, sticky='w', padx=5, pady=2)
+
+        ttk.Label(settings_frame, text="SMTP connections:").grid(row=3, column=2, sticky='w', padx=5)
+        self.smtp_connections_var = tk.IntVar(value=2)
+        ttk.Spinbox(settings_frame, from_=1, to=8, width=8, textvariable=self.smtp_connections_var).grid(row=3, column=3, sticky='w', padx=5, pady=2)
+        
         ttk.Button(settings_frame, text="Test Connection", command=self.test_email_connection).grid(row=3, column=0, columnspan=2, pady=10)
         
         # Email Templates
@@ -357,6 +2871,13 @@ class JobSearchApp:
         ttk.Button(controls_frame, text="Send Selected", command=self.send_selected_emails).pack(side='left', padx=5)
         ttk.Button(controls_frame, text="Send All", command=self.send_all_emails).pack(side='left', padx=5)
         ttk.Button(controls_frame, text="Delete Selected", command=self.delete_selected_email).pack(side='left', padx=5)
+        self.cancel_send_button = ttk.Button(controls_frame, text="Cancel Sending", state='disabled',
+                                             command=self.cancel_sending)
+        self.cancel_send_button.pack(side='left', padx=5)
+        self.send_progress = ttk.Progressbar(controls_frame, mode='determinate', length=200)
+        self.send_progress.pack(side='left', padx=5)
+        self.send_status_label = ttk.Label(controls_frame, text="")
+        self.send_status_label.pack(side='left', padx=5)
         
         # Email Queue Treeview
         queue_tree_frame = ttk.Frame(self.queue_tab)
@@ -378,7 +2899,23 @@ class JobSearchApp:
         # Scrollbars for email queue
         v_scrollbar2 = ttk.Scrollbar(queue_tree_frame, orient='vertical', command=self.email_tree.yview)
         h_scrollbar2 = ttk.Scrollbar(queue_tree_frame, orient='horizontal', command=self.email_tree.xview)
-        self.email_tree.configure(yscrollcommand=v_scrollbar2.set, xscrollcommand=h_scrollbar2.set)
+        self.email_tree.configure(xscrollcommand=h_scrollbar2.set)
+
+        self.email_pager = PagedTreeview(
+            self.email_tree, v_scrollbar2, self.conn,
+            id_column='eq.id',
+            columns=['j.company_name', 'j.job_title', 'eq.recipient_email', 'eq.status'],
+            sort_keys={
+                'Created': "COALESCE(eq.created_date, '')",
+                'Company': 'j.company_name',
+                'Job Title': 'j.job_title',
+                'Email': "COALESCE(eq.recipient_email, '')",
+                'Status': "COALESCE(eq.status, '')",
+            },
+            format_row=tuple,
+            changes_table='email_queue',
+            descending_first=('Created',)
+        )
         
         # Pack treeview and scrollbars
         self.email_tree.pack(side='left', fill='both', expand=True)
@@ -395,6 +2932,39 @@ class JobSearchApp:
         # Bind selection event
         self.email_tree.bind('<<TreeviewSelect>>', self.on_email_select)
         
+    def on_model_state_change(self, summarizer, state):
+        """Show the summarization model state (called from the summarizer's listener thread)"""
+        if summarizer is not self.summarizer:
+            return  # A model the user has since switched away from
+        if state == 'loading':
+            text = f"Model: loading {summarizer.name}..."
+        elif state == 'failed':
+            text = f"Model: failed to load ({summarizer.error})"
+        elif state == 'released':
+            text = "Model: released (idle)"
+        else:
+            text = f"Model: {state}"
+        self.root.after(0, lambda: self.model_status_label.config(text=text))
+
+    def change_summary_model(self, event=None):
+        """Switch to another summarization checkpoint or backend and start loading it"""
+        model_name = self.model_var.get()
+        backend = self.backend_var.get()
+        if model_name == self.summarizer.model_name and backend == self.summarizer.backend:
+            return
+        old_summarizer = self.summarizer
+        self.summarizer = SummarizerProcess(model_name, backend, on_state_change=self.on_model_state_change)
+        # Joining the old worker can take seconds; keep it off the Tk thread
+        threading.Thread(target=old_summarizer.close, daemon=True).start()
+        self.summarizer.load_async()
+
+    def change_summary_batch_size(self):
+        """Apply the batch size chosen in the Setup tab"""
+        try:
+            self.summary_batch_size = max(1, int(self.batch_size_var.get()))
+        except (tk.TclError, ValueError):
+            pass
+
     def upload_cv(self):
         """Upload and read CV file"""
         file_path = filedialog.askopenfilename(
@@ -410,6 +2980,7 @@ class JobSearchApp:
             self.cv_label.config(text=f"CV loaded: {os.path.basename(file_path)}")
             self.cv_text.delete('1.0', tk.END)
             self.cv_text.insert('1.0', self.cv_content)
+            self.rank_jobs()
             
     def read_cv_file(self, file_path):
         """Read content from CV file"""
@@ -455,38 +3026,14 @@ class JobSearchApp:
             messagebox.showwarning("Warning", "Please upload a CV first")
             return
     
-        cv_text = self.cv_content.lower()
-    
-        # Define lists of skills, technologies, and job titles
-        tech_skills = [
-            'python', 'javascript', 'php', 'laravel', 'node.js', 'angular', 'react',
-            'mysql', 'postgresql', 'mongodb', 'git', 'docker', 'aws', 'azure',
-            'jenkins', 'ci/cd', 'rest api', 'graphql', 'full stack', 'backend',
-            'frontend', 'web development', 'software development', 'database',
-            'agile', 'scrum', 'devops', 'machine learning', 'ai', 'data science'
-        ]
-        job_titles = [
-            'developer', 'engineer', 'software engineer', 'web developer', 'backend developer',
-            'frontend developer', 'full stack developer', 'data scientist', 'devops engineer',
-            'project manager', 'product manager', 'qa engineer', 'test engineer'
-        ]
-        soft_skills = [
-            'leadership', 'communication', 'teamwork', 'problem solving', 'adaptability',
-            'critical thinking', 'collaboration', 'creativity', 'time management'
-        ]
-    
-        # Combine all keywords
-        all_keywords = tech_skills + job_titles + soft_skills
-    
-        # Find all keywords in CV using regex for word boundaries
-        found = []
-        for kw in all_keywords:
-            if re.search(r'\b' + re.escape(kw) + r'\b', cv_text):
-                found.append(kw.title())
-    
-        # Remove duplicates and sort by frequency in CV
-        found = list(dict.fromkeys(found))
-        found_sorted = sorted(found, key=lambda x: cv_text.count(x.lower()), reverse=True)
+        try:
+            matcher = keyword_matcher()
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not load the skill taxonomy: {str(e)}")
+            return
+
+        # All taxonomy terms and their frequencies in one pass over the CV
+        found_sorted = [name for name, count in matcher.find(self.cv_content)]
     
         # Set keywords in search tab (top 10)
         keywords = ", ".join(found_sorted[:10])
@@ -500,6 +3047,12 @@ class JobSearchApp:
     
     def start_job_search(self):
         """Start job search in a separate thread"""
+        if self.search_thread is not None and self.search_thread.is_alive():
+            # A stopped search is still draining its detail pipeline; starting
+            # now would share the pipeline and stop flag with it
+            messagebox.showinfo("Search Running", "The previous search is still finishing. Please try again in a moment.")
+            return
+
         if not self.cv_content:
             messagebox.showwarning("Warning", "Please upload a CV first")
             return
@@ -514,11 +3067,17 @@ class JobSearchApp:
         # Check if keywords/location changed
         if keywords != self.last_search_keywords or location != self.last_search_location:
             self.last_site_index = 0  # Reset to first site
+            self.completed_sites = set()
     
         self.last_search_keywords = keywords
         self.last_search_location = location
     
         self.stop_search_flag = False  # Reset stop flag before starting
+        self.incremental_search = self.incremental_var.get()
+
+        # Launch browsers in the background while the first sites start up
+        threading.Thread(target=self.driver_pool.warm, daemon=True).start()
+
         self.search_thread = threading.Thread(
             target=self.search_jobs, 
             args=(keywords, location, self.last_site_index)
@@ -534,43 +3093,135 @@ class JobSearchApp:
         self.update_search_results("Stopping search...\n")
         
     def search_jobs(self, keywords, location, start_index=0):
-        """Search for jobs on various platforms"""
+        """Search for jobs on various platforms, running the selected sites concurrently"""
         selected_sites = [site for site, var in self.site_vars.items() if var.get()]
         self.update_search_results(f"Starting job search for: {keywords} in {location}\n")
         self.update_search_results(f"Searching on: {', '.join(selected_sites)}\n\n")
-        jobs_found = 0
-        for idx, site in enumerate(selected_sites[start_index:], start=start_index):
-            if self.stop_search_flag:
-                self.update_search_results("Search stopped by user.\n")
-                self.last_site_index = idx  # Save where we stopped
-                break
-            try:
-                if site == 'Indeed':
-                    jobs_found += self.search_indeed(keywords, location)
-                elif site == 'Glassdoor':
-                    jobs_found += self.search_glassdoor(keywords, location)
-                elif site == 'CareerBuilder':
-                    jobs_found += self.search_careerbuilder(keywords, location)
-                elif site == 'Google Jobs':
-                    jobs_found += self.search_google_jobs(keywords, location)
-                elif site == 'BrighterMonday':
-                    jobs_found += self.search_brightermonday(keywords, location)
-                elif site == 'Remote OK':
-                    jobs_found += self.search_remoteok(keywords)
-                elif site == 'We Work Remotely':
-                    jobs_found += self.search_weworkremotely(keywords)
-            except Exception as e:
-                self.update_search_results(f"Error searching {site}: {str(e)}\n")
-            if self.stop_search_flag:
-                self.update_search_results("Search stopped by user.\n")
-                self.last_site_index = idx  # Save where we stopped
-                break
+
+        self.load_known_fingerprints()
+        self.page_cache.prune()
+
+        # Listing scrapers feed job stubs to the detail workers, which save them
+        self.pipeline = DetailPipeline(
+            self.fetch_job_details,
+            self.save_scraped_job,
+            workers=self.detail_workers,
+            should_stop=lambda: self.stop_search_flag
+        )
+        self.pipeline.start()
+
+        # Sites finished in an earlier, stopped run with the same query are not searched again
+        pending_sites = [site for site in selected_sites[start_index:] if site not in self.completed_sites]
+
+        # Each site walks its listing pages in its own worker, so its own delays still apply
+        with ThreadPoolExecutor(max_workers=max(1, self.max_search_workers)) as executor:
+            futures = {
+                executor.submit(self.search_site, site, keywords, location): site
+                for site in pending_sites
+            }
+            for future in as_completed(futures):
+                site = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    self.update_search_results(f"Error searching {site}: {str(e)}\n")
+                if not self.stop_search_flag:
+                    self.completed_sites.add(site)
+
+        # Wait for the detail workers to finish the queued jobs
+        self.pipeline.join()
+        self.pipeline.close()
+        jobs_found = self.pipeline.saved_count
+        self.job_writer.flush()
+
+        if self.stop_search_flag:
+            self.update_search_results("Search stopped by user.\n")
+            # Resume from the first selected site that did not finish
+            unfinished = [idx for idx, site in enumerate(selected_sites) if site not in self.completed_sites]
+            self.last_site_index = unfinished[0] if unfinished else 0
         else:
             self.last_site_index = 0  # Reset if finished all sites
-    
+            self.completed_sites = set()
+
         self.update_search_results(f"\nSearch completed! Found {jobs_found} jobs total.\n")
         self.progress.stop()
-        
+        self.root.after(0, self.rank_jobs)
+
+    def load_known_fingerprints(self):
+        """Load the fingerprints of every stored job so known postings can be skipped"""
+        conn = connect_db()
+        try:
+            rows = conn.execute('SELECT url_fingerprint FROM jobs WHERE url_fingerprint IS NOT NULL').fetchall()
+        finally:
+            conn.close()
+        with self.known_fingerprints_lock:
+            self.known_fingerprints = {row[0] for row in rows}
+
+    def claim_job(self, job):
+        """Return True if the job is new; known jobs are not fetched or saved again"""
+        job['fingerprint'] = job_fingerprint(job)
+        with self.known_fingerprints_lock:
+            if job['fingerprint'] in self.known_fingerprints:
+                return False
+            self.known_fingerprints.add(job['fingerprint'])
+            return True
+
+    def get_watermark(self, site, keywords, location):
+        """Fingerprint of the newest posting seen by the last run of this query on a site"""
+        conn = connect_db()
+        try:
+            row = conn.execute(
+                'SELECT newest_fingerprint FROM search_watermarks WHERE site = ? AND keywords = ? AND location = ?',
+                (site, keywords, location)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def save_watermark(self, site, keywords, location, newest_fingerprint):
+        """Remember the newest posting of this query on a site"""
+        conn = connect_db()
+        try:
+            with conn:
+                conn.execute('''
+                    INSERT INTO search_watermarks (site, keywords, location, newest_fingerprint, last_run)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(site, keywords, location) DO UPDATE SET
+                        newest_fingerprint = excluded.newest_fingerprint,
+                        last_run = excluded.last_run
+                ''', (site, keywords, location, newest_fingerprint, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        finally:
+            conn.close()
+
+    def page_is_mostly_known(self, watermark, page_fingerprints, page_known):
+        """In incremental mode, True once a listing page reaches the last run's
+        newest posting or is mostly postings that are already stored"""
+        if not self.incremental_search or not page_fingerprints:
+            return False
+        if watermark and watermark in page_fingerprints:
+            return True
+        return page_known / len(page_fingerprints) >= self.incremental_known_ratio
+
+    def search_site(self, site, keywords, location):
+        """Run the scraper for a single job site and return the number of jobs found"""
+        if self.stop_search_flag:
+            return 0
+        if site == 'Indeed':
+            return self.search_indeed(keywords, location)
+        elif site == 'Glassdoor':
+            return self.search_glassdoor(keywords, location)
+        elif site == 'CareerBuilder':
+            return self.search_careerbuilder(keywords, location)
+        elif site == 'Google Jobs':
+            return self.search_google_jobs(keywords, location)
+        elif site == 'BrighterMonday':
+            return self.search_brightermonday(keywords, location)
+        elif site == 'Remote OK':
+            return self.search_remoteok(keywords)
+        elif site == 'We Work Remotely':
+            return self.search_weworkremotely(keywords)
+        return 0
+
     def get_edge_driver(self):
         edge_options = EdgeOptions()
         edge_options.add_argument('--headless')  #
@@ -582,283 +3233,265 @@ class JobSearchApp:
         driver = webdriver.Edge(service=EdgeService(driver_path), options=edge_options)
         return driver
     
-    def search_indeed(self, keywords, location, max_pages=3):
-        """Search Indeed for jobs using Selenium to bypass anti-bot measures."""
+    def get_site_throttle(self, site):
+        """Return the politeness throttle shared by all requests to a site"""
+        with self.site_throttles_lock:
+            if site not in self.site_throttles:
+                self.site_throttles[site] = SiteThrottle(max_concurrent=self.max_requests_per_site)
+            return self.site_throttles[site]
+
+    def page_cache_ttl(self, site, kind='listing'):
+        """Seconds a cached listing or detail page of a site stays fresh"""
+        listing_ttl, detail_ttl = PAGE_CACHE_TTLS.get(site, DEFAULT_PAGE_CACHE_TTLS)
+        return listing_ttl if kind == 'listing' else detail_ttl
+
+    def fetch_page(self, site, url, expect_selector, render_delay=(2, 4), kind='listing'):
+        """Fetch and parse a page, reading through the page cache and using
+        plain HTTP when possible and a browser otherwise"""
+        ttl = self.page_cache_ttl(site, kind)
+        html = self.page_cache.get_fresh(url, ttl)
+        if html is not None:
+            soup = BeautifulSoup(html, 'lxml')
+            if soup.select_one(expect_selector):
+                return soup
+        with self.get_site_throttle(site).slot():
+            html = self.http.fetch(url, expect_selector, ttl=ttl)
+            if html is not None:
+                return BeautifulSoup(html, 'lxml')
+            with self.driver_pool.driver() as driver:
+                self.driver_pool.load(driver, url)
+                time.sleep(random.uniform(*render_delay))  # Randomized delay
+                html = driver.page_source
+        soup = BeautifulSoup(html, 'lxml')
+        # Block pages and pages without the expected content are not cached
+        if not self.http.is_block_page(html) and soup.select_one(expect_selector):
+            self.page_cache.put(url, html)
+        return soup
+
+    def crawl_listing(self, site, page_url, card_selector, parse_card, detail_selectors, max_pages=3, query=('', '')):
+        """Walk a site's listing pages and queue every new job card for the detail workers.
+
+        page_url(page) builds the URL of a listing page and parse_card(job_card)
+        turns a card into a job stub. query is the (keywords, location) pair the
+        site's watermark is stored under; in incremental mode paging stops once
+        a page is mostly postings we already have. Returns the number of jobs queued.
+        """
+        self.update_search_results(f"Searching {site}...\n")
+        jobs_found = 0
+        known = 0
+        logger = logging.getLogger(__name__)
+        watermark = self.get_watermark(site, *query)
+        newest = None
         try:
-            self.update_search_results("Searching Indeed...\n")
-            jobs_found = 0
-            logger = logging.getLogger(__name__)
-            
-            # Configure headless Chrome
-            driver = self.get_edge_driver()
-            
-            base_url = "https://www.indeed.com/jobs"
-            params = {
-                'q': keywords,
-                'l': location,
-                'fromage': '7'  # Last 7 days
-            }
-            
             for page in range(max_pages):
-                params['start'] = page * 10
-                url = f"{base_url}?q={quote_plus(keywords)}&l={quote_plus(location)}&fromage=7&start={page * 10}"
-                driver.get(url)
-                time.sleep(random.uniform(2, 4))  # Randomized delay
-                soup = BeautifulSoup(driver.page_source, 'lxml')
-                job_cards = soup.select('div.job_seen_beacon')
-                
+                if self.stop_search_flag:
+                    break
+                soup = self.fetch_page(site, page_url(page), card_selector)
+                job_cards = soup.select(card_selector)
+
                 if not job_cards:
-                    logger.info(f"No more jobs found on Indeed page {page + 1}")
-                    self.update_search_results(f"No more jobs found on Indeed page {page + 1}\n")
+                    logger.info(f"No more jobs found on {site} page {page + 1}")
+                    self.update_search_results(f"No more jobs found on {site} page {page + 1}\n")
                     break
-                    
+
+                page_fingerprints = []
+                page_known = 0
                 for job_card in job_cards:
+                    if self.stop_search_flag:
+                        break
                     try:
-                        title = job_card.select_one('h2.jobTitle span')
-                        company = job_card.select_one('span.companyName')
-                        location_elem = job_card.select_one('div.companyLocation')
-                        url_elem = job_card.select_one('a')
-                        description_elem = job_card.select_one('div.job-snippet')
-                        
-                        job = {
-                            'company': company.get_text(strip=True) if company else 'N/A',
-                            'title': title.get_text(strip=True) if title else 'N/A',
-                            'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
-                            'email': '',
-                            'description': description_elem.get_text(strip=True) if description_elem else '',
-                            'url': urljoin("https://www.indeed.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
-                            'salary': ''
-                        }
-                        
-                        if job['url']:
-                            driver.get(job['url'])
-                            time.sleep(random.uniform(1, 2))
-                            try:
-                                job_page = BeautifulSoup(driver.page_source, 'lxml')
-                                description_elem = job_page.select_one('div#jobDescriptionText')
-                                if description_elem:
-                                    job['description'] = description_elem.get_text(strip=True)
-                                salary_elem = job_page.select_one('div#salaryInfoAndJobType')
-                                if salary_elem:
-                                    job['salary'] = salary_elem.get_text(strip=True)
-                                emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job['description'])
-                                if emails:
-                                    job['email'] = emails[0]
-                            except Exception as e:
-                                logger.warning(f"Error fetching details for job {job['title']}: {str(e)}")
-                        
-                        self.save_job_to_db(job)
+                        job = parse_card(job_card)
+                        is_new = self.claim_job(job)
+                        page_fingerprints.append(job['fingerprint'])
+                        if not is_new:
+                            known += 1
+                            page_known += 1
+                            continue
+                        self.pipeline.submit(job, site, detail_selectors)
                         jobs_found += 1
-                        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
-                        time.sleep(random.uniform(0.5, 1))
-                        
                     except Exception as e:
-                        logger.error(f"Error processing Indeed job card: {str(e)}")
+                        logger.error(f"Error processing {site} job card: {str(e)}")
                         continue
-                
+
+                if newest is None and page_fingerprints:
+                    newest = page_fingerprints[0]
+                if self.page_is_mostly_known(watermark, page_fingerprints, page_known):
+                    self.update_search_results(f"{site}: page {page + 1} is mostly known postings, stopping early\n")
+                    break
+
                 time.sleep(random.uniform(2, 4))
-            
-            driver.quit()
-            logger.info(f"Indeed search completed. Found {jobs_found} jobs.")
-            self.update_search_results(f"Indeed search completed. Found {jobs_found} jobs.\n")
+
+            if newest and not self.stop_search_flag:
+                self.save_watermark(site, *query, newest)
+            logger.info(f"{site} search completed. Found {jobs_found} new jobs, skipped {known} already stored.")
+            self.update_search_results(f"{site} search completed. Found {jobs_found} new jobs, skipped {known} already stored.\n")
             return jobs_found
-            
+
         except Exception as e:
-            logger.error(f"Error in Indeed search: {str(e)}")
-            self.update_search_results(f"Error searching Indeed: {str(e)}\n")
-            if 'driver' in locals():
-                driver.quit()
-            return 0
-    
+            logger.error(f"Error in {site} search: {str(e)}")
+            self.update_search_results(f"Error searching {site}: {str(e)}\n")
+            return jobs_found
+
+    def parse_job_details(self, job, job_page, detail_selectors):
+        """Fill in description, salary, URL and email from a parsed detail page"""
+        description_elem = job_page.select_one(detail_selectors['description'])
+        if description_elem:
+            job['description'] = description_elem.get_text(strip=True)
+        salary_elem = job_page.select_one(detail_selectors['salary'])
+        if salary_elem:
+            job['salary'] = salary_elem.get_text(strip=True)
+        if 'url' in detail_selectors:
+            url_elem = job_page.select_one(detail_selectors['url'])
+            if url_elem and url_elem.has_attr('href'):
+                job['url'] = url_elem['href']
+        emails = re.findall(EMAIL_PATTERN, job['description'])
+        if emails:
+            job['email'] = emails[0]
+
+    def fetch_job_details(self, job, site, detail_selectors):
+        """Detail stage: load a job's own page and parse it"""
+        try:
+            job_page = self.fetch_page(site, job['url'], detail_selectors['description'], render_delay=(1, 2), kind='detail')
+            self.parse_job_details(job, job_page, detail_selectors)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Error fetching details for job {job['title']}: {str(e)}")
+
+    def save_scraped_job(self, job, site):
+        """Save stage: store a completed job and report it"""
+        self.save_job_to_db(job)
+        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
+
+    def search_indeed(self, keywords, location, max_pages=3):
+        """Search Indeed for jobs using Selenium to bypass anti-bot measures."""
+        def page_url(page):
+            return f"https://www.indeed.com/jobs?q={quote_plus(keywords)}&l={quote_plus(location)}&fromage=7&start={page * 10}"  # Last 7 days
+
+        def parse_card(job_card):
+            title = job_card.select_one('h2.jobTitle span')
+            company = job_card.select_one('span.companyName')
+            location_elem = job_card.select_one('div.companyLocation')
+            url_elem = job_card.select_one('a')
+            description_elem = job_card.select_one('div.job-snippet')
+
+            return {
+                'company': company.get_text(strip=True) if company else 'N/A',
+                'title': title.get_text(strip=True) if title else 'N/A',
+                'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
+                'email': '',
+                'description': description_elem.get_text(strip=True) if description_elem else '',
+                'url': urljoin("https://www.indeed.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
+                'salary': ''
+            }
+
+        return self.crawl_listing(
+            'Indeed', page_url, 'div.job_seen_beacon', parse_card,
+            {'description': 'div#jobDescriptionText', 'salary': 'div#salaryInfoAndJobType'},
+            max_pages, query=(keywords, location)
+        )
+
     def search_glassdoor(self, keywords, location, max_pages=3):
         """Search Glassdoor for jobs using Selenium to bypass anti-bot measures."""
-        try:
-            self.update_search_results("Searching Glassdoor...\n")
-            jobs_found = 0
-            logger = logging.getLogger(__name__)
-            
-            driver = self.get_edge_driver()
+        def page_url(page):
+            return f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={quote_plus(keywords)}&locT=C&locKeyword={quote_plus(location)}&page={page + 1}"
 
-            base_url = "https://www.glassdoor.com/Job/jobs.htm"
-            
-            for page in range(max_pages):
-                url = f"{base_url}?sc.keyword={quote_plus(keywords)}&locT=C&locKeyword={quote_plus(location)}&page={page + 1}"
-                driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                soup = BeautifulSoup(driver.page_source, 'lxml')
-                job_cards = soup.select('li.react-job-listing')
-                
-                if not job_cards:
-                    logger.info(f"No more jobs found on Glassdoor page {page + 1}")
-                    self.update_search_results(f"No more jobs found on Glassdoor page {page + 1}\n")
-                    break
-                    
-                for job_card in job_cards:
-                    try:
-                        title_elem = job_card.select_one('a.jobLink span')
-                        company_elem = job_card.select_one('div.jobHeader a')
-                        location_elem = job_card.select_one('span.pr-xxsm')
-                        url_elem = job_card.select_one('a.jobLink')
-                        
-                        job = {
-                            'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
-                            'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
-                            'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
-                            'email': '',
-                            'description': '',
-                            'url': urljoin("https://www.glassdoor.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
-                            'salary': ''
-                        }
-                        
-                        if job['url']:
-                            driver.get(job['url'])
-                            time.sleep(random.uniform(1, 2))
-                            try:
-                                job_page = BeautifulSoup(driver.page_source, 'lxml')
-                                description_elem = job_page.select_one('div.desc')
-                                if description_elem:
-                                    job['description'] = description_elem.get_text(strip=True)
-                                salary_elem = job_page.select_one('span.salary')
-                                if salary_elem:
-                                    job['salary'] = salary_elem.get_text(strip=True)
-                                emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job['description'])
-                                if emails:
-                                    job['email'] = emails[0]
-                            except Exception as e:
-                                logger.warning(f"Error fetching details for job {job['title']}: {str(e)}")
-                        
-                        self.save_job_to_db(job)
-                        jobs_found += 1
-                        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
-                        time.sleep(random.uniform(0.5, 1))
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing Glassdoor job card: {str(e)}")
-                        continue
-                
-                time.sleep(random.uniform(2, 4))
-            
-            driver.quit()
-            logger.info(f"Glassdoor search completed. Found {jobs_found} jobs.")
-            self.update_search_results(f"Glassdoor search completed. Found {jobs_found} jobs.\n")
-            return jobs_found
-            
-        except Exception as e:
-            logger.error(f"Error in Glassdoor search: {str(e)}")
-            self.update_search_results(f"Error searching Glassdoor: {str(e)}\n")
-            if 'driver' in locals():
-                driver.quit()
-            return 0
+        def parse_card(job_card):
+            title_elem = job_card.select_one('a.jobLink span')
+            company_elem = job_card.select_one('div.jobHeader a')
+            location_elem = job_card.select_one('span.pr-xxsm')
+            url_elem = job_card.select_one('a.jobLink')
+
+            return {
+                'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
+                'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
+                'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
+                'email': '',
+                'description': '',
+                'url': urljoin("https://www.glassdoor.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
+                'salary': ''
+            }
+
+        return self.crawl_listing(
+            'Glassdoor', page_url, 'li.react-job-listing', parse_card,
+            {'description': 'div.desc', 'salary': 'span.salary'},
+            max_pages, query=(keywords, location)
+        )
 
     def search_careerbuilder(self, keywords, location, max_pages=3):
         """Search CareerBuilder for jobs using Selenium to bypass anti-bot measures."""
-        try:
-            self.update_search_results("Searching CareerBuilder...\n")
-            jobs_found = 0
-            logger = logging.getLogger(__name__)
-            
-            driver = self.get_edge_driver()
-            
-            base_url = "https://www.careerbuilder.com/jobs"
-            
-            for page in range(max_pages):
-                url = f"{base_url}?keywords={quote_plus(keywords)}&location={quote_plus(location)}&page={page + 1}"
-                driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                soup = BeautifulSoup(driver.page_source, 'lxml')
-                job_cards = soup.select('div.data-results-content-parent div.data-results-content-block')
-                
-                if not job_cards:
-                    logger.info(f"No more jobs found on CareerBuilder page {page + 1}")
-                    self.update_search_results(f"No more jobs found on CareerBuilder page {page + 1}\n")
-                    break
-                    
-                for job_card in job_cards:
-                    try:
-                        title_elem = job_card.select_one('h2 a')
-                        company_elem = job_card.select_one('div.data-details span[data-company]')
-                        location_elem = job_card.select_one('div.data-details span[data-location]')
-                        url_elem = job_card.select_one('h2 a')
-                        
-                        job = {
-                            'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
-                            'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
-                            'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
-                            'email': '',
-                            'description': '',
-                            'url': url_elem['href'] if url_elem and url_elem.has_attr('href') else '',
-                            'salary': ''
-                        }
-                        
-                        if job['url']:
-                            driver.get(job['url'])
-                            time.sleep(random.uniform(1, 2))
-                            try:
-                                job_page = BeautifulSoup(driver.page_source, 'lxml')
-                                description_elem = job_page.select_one('div.job-description')
-                                if description_elem:
-                                    job['description'] = description_elem.get_text(strip=True)
-                                salary_elem = job_page.select_one('div.salary')
-                                if salary_elem:
-                                    job['salary'] = salary_elem.get_text(strip=True)
-                                emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job['description'])
-                                if emails:
-                                    job['email'] = emails[0]
-                            except Exception as e:
-                                logger.warning(f"Error fetching details for job {job['title']}: {str(e)}")
-                        
-                        self.save_job_to_db(job)
-                        jobs_found += 1
-                        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
-                        time.sleep(random.uniform(0.5, 1))
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing CareerBuilder job card: {str(e)}")
-                        continue
-                
-                time.sleep(random.uniform(2, 4))
-            
-            driver.quit()
-            logger.info(f"CareerBuilder search completed. Found {jobs_found} jobs.")
-            self.update_search_results(f"CareerBuilder search completed. Found {jobs_found} jobs.\n")
-            return jobs_found
-            
-        except Exception as e:
-            logger.error(f"Error in CareerBuilder search: {str(e)}")
-            self.update_search_results(f"Error searching CareerBuilder: {str(e)}\n")
-            if 'driver' in locals():
-                driver.quit()
-            return 0
+        def page_url(page):
+            return f"https://www.careerbuilder.com/jobs?keywords={quote_plus(keywords)}&location={quote_plus(location)}&page={page + 1}"
+
+        def parse_card(job_card):
+            title_elem = job_card.select_one('h2 a')
+            company_elem = job_card.select_one('div.data-details span[data-company]')
+            location_elem = job_card.select_one('div.data-details span[data-location]')
+            url_elem = job_card.select_one('h2 a')
+
+            return {
+                'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
+                'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
+                'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
+                'email': '',
+                'description': '',
+                'url': url_elem['href'] if url_elem and url_elem.has_attr('href') else '',
+                'salary': ''
+            }
+
+        return self.crawl_listing(
+            'CareerBuilder', page_url, 'div.data-results-content-parent div.data-results-content-block', parse_card,
+            {'description': 'div.job-description', 'salary': 'div.salary'},
+            max_pages, query=(keywords, location)
+        )
 
     def search_google_jobs(self, keywords, location, max_pages=3):
-        """Search Google Jobs using Selenium to bypass anti-bot measures."""
+        """Search Google Jobs using Selenium to bypass anti-bot measures.
+
+        Google Jobs cards have no detail URL; details only appear after clicking
+        a card, so they are read here in the listing browser rather than by the
+        detail workers.
+        """
+        logger = logging.getLogger(__name__)
+        driver = None
         try:
             self.update_search_results("Searching Google Jobs...\n")
             jobs_found = 0
-            logger = logging.getLogger(__name__)
-            
-            driver = self.get_edge_driver()
-            
+
+            watermark = self.get_watermark('Google Jobs', keywords, location)
+            newest = None
+
+            driver = self.driver_pool.acquire()
+
             query = f"{keywords} jobs in {location}"
-            
+            detail_selectors = {
+                'description': 'div[class*="nDgy9d"]',
+                'salary': 'div[class*="nDgy9d"] span[class*="salary"]',
+                'url': 'a[class*="pMhGee"]'
+            }
+
             for page in range(max_pages):
+                if self.stop_search_flag:
+                    break
                 url = f"https://www.google.com/search?q={quote_plus(query)}&start={page * 10}"
-                driver.get(url)
+                self.driver_pool.load(driver, url)
                 time.sleep(random.uniform(3, 5))
                 soup = BeautifulSoup(driver.page_source, 'lxml')
                 job_cards = soup.select('div[jsname="QGGMK"]')
-                
+
                 if not job_cards:
                     logger.info(f"No more jobs found on Google Jobs page {page + 1}")
                     self.update_search_results(f"No more jobs found on Google Jobs page {page + 1}\n")
                     break
-                    
+
+                page_fingerprints = []
+                page_known = 0
                 for job_card in job_cards:
+                    if self.stop_search_flag:
+                        break
                     try:
                         title_elem = job_card.select_one('div[role="heading"]')
                         company_elem = job_card.select_one('div[class*="vNEEBe"]')
                         location_elem = job_card.select_one('div[class*="Qk80Jf"]')
-                        
+
                         job = {
                             'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
                             'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
@@ -868,329 +3501,336 @@ class JobSearchApp:
                             'url': '',
                             'salary': ''
                         }
-                        
+                        is_new = self.claim_job(job)
+                        page_fingerprints.append(job['fingerprint'])
+                        if not is_new:
+                            page_known += 1
+                            continue
+
                         try:
                             job_card_elem = driver.find_element(By.CSS_SELECTOR, 'div[jsname="QGGMK"]')
                             job_card_elem.click()
                             time.sleep(random.uniform(1, 2))
                             job_page = BeautifulSoup(driver.page_source, 'lxml')
-                            description_elem = job_page.select_one('div[class*="nDgy9d"]')
-                            if description_elem:
-                                job['description'] = description_elem.get_text(strip=True)
-                            salary_elem = job_page.select_one('div[class*="nDgy9d"] span[class*="salary"]')
-                            if salary_elem:
-                                job['salary'] = salary_elem.get_text(strip=True)
-                            emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job['description'])
-                            if emails:
-                                job['email'] = emails[0]
-                            url_elem = job_page.select_one('a[class*="pMhGee"]')
-                            if url_elem and url_elem.has_attr('href'):
-                                job['url'] = url_elem['href']
+                            self.parse_job_details(job, job_page, detail_selectors)
                         except Exception as e:
                             logger.warning(f"Error fetching details for job {job['title']}: {str(e)}")
-                        
-                        self.save_job_to_db(job)
+
+                        # Details are already filled in, so this goes straight to the save stage
+                        self.pipeline.submit(job, 'Google Jobs')
                         jobs_found += 1
-                        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
                         time.sleep(random.uniform(0.5, 1))
-                        
+
                     except Exception as e:
                         logger.error(f"Error processing Google Jobs card: {str(e)}")
                         continue
-                
+
+                if newest is None and page_fingerprints:
+                    newest = page_fingerprints[0]
+                if self.page_is_mostly_known(watermark, page_fingerprints, page_known):
+                    self.update_search_results(f"Google Jobs: page {page + 1} is mostly known postings, stopping early\n")
+                    break
+
                 time.sleep(random.uniform(3, 5))
-            
-            driver.quit()
+
+            if newest and not self.stop_search_flag:
+                self.save_watermark('Google Jobs', keywords, location, newest)
             logger.info(f"Google Jobs search completed. Found {jobs_found} jobs.")
             self.update_search_results(f"Google Jobs search completed. Found {jobs_found} jobs.\n")
             return jobs_found
-            
+
         except Exception as e:
             logger.error(f"Error in Google Jobs search: {str(e)}")
             self.update_search_results(f"Error searching Google Jobs: {str(e)}\n")
-            if 'driver' in locals():
-                driver.quit()
             return 0
+        finally:
+            # Released exactly once, whichever way the search ended
+            if driver is not None:
+                self.driver_pool.release(driver)
 
     def search_remoteok(self, keywords, max_pages=3):
-        """Search Remote OK for jobs using Selenium to bypass anti-bot measures."""
-        try:
-            self.update_search_results("Searching Remote OK...\n")
+        """Search Remote OK through its public JSON feed, crawling the site if the feed is unavailable."""
+        logger = logging.getLogger(__name__)
+        self.update_search_results("Searching Remote OK...\n")
+        postings = {}
+        feed_ok = False
+        for term in [kw.strip() for kw in keywords.split(',') if kw.strip()]:
+            if self.stop_search_flag:
+                break
+            tag = re.sub(r'[^a-z0-9]+', '-', term.lower()).strip('-')
+            with self.get_site_throttle('Remote OK').slot():
+                feed = self.http.fetch_json(
+                    f"https://remoteok.com/api?tag={quote_plus(tag)}",
+                    ttl=self.page_cache_ttl('Remote OK')
+                )
+            if not isinstance(feed, list):
+                continue
+            feed_ok = True
+            for item in feed:
+                # The first entry of the feed is a legal notice, not a job
+                if isinstance(item, dict) and item.get('position'):
+                    postings[item.get('id') or item.get('url')] = item
+
+        if feed_ok:
             jobs_found = 0
-            logger = logging.getLogger(__name__)
-            
-            driver = self.get_edge_driver()
-            
-            base_url = f"https://remoteok.com/remote-{quote_plus(keywords)}-jobs"
-            
-            for page in range(max_pages):
-                url = f"{base_url}?page={page + 1}"
-                driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                soup = BeautifulSoup(driver.page_source, 'lxml')
-                job_cards = soup.select('tr.job')
-                
-                if not job_cards:
-                    logger.info(f"No more jobs found on Remote OK page {page + 1}")
-                    self.update_search_results(f"No more jobs found on Remote OK page {page + 1}\n")
+            for item in postings.values():
+                if self.stop_search_flag:
                     break
-                    
-                for job_card in job_cards:
-                    try:
-                        title_elem = job_card.select_one('h2')
-                        company_elem = job_card.select_one('td.company')
-                        url_elem = job_card.select_one('a.preventLink')
-                        
-                        job = {
-                            'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
-                            'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
-                            'location': 'Remote',
-                            'email': '',
-                            'description': '',
-                            'url': urljoin("https://remoteok.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
-                            'salary': ''
-                        }
-                        
-                        if job['url']:
-                            driver.get(job['url'])
-                            time.sleep(random.uniform(1, 2))
-                            try:
-                                job_page = BeautifulSoup(driver.page_source, 'lxml')
-                                description_elem = job_page.select_one('div.description')
-                                if description_elem:
-                                    job['description'] = description_elem.get_text(strip=True)
-                                salary_elem = job_page.select_one('span.salary')
-                                if salary_elem:
-                                    job['salary'] = salary_elem.get_text(strip=True)
-                                emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job['description'])
-                                if emails:
-                                    job['email'] = emails[0]
-                            except Exception as e:
-                                logger.warning(f"Error fetching details for job {job['title']}: {str(e)}")
-                        
-                        self.save_job_to_db(job)
-                        jobs_found += 1
-                        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
-                        time.sleep(random.uniform(0.5, 1))
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing Remote OK job card: {str(e)}")
+                try:
+                    description = BeautifulSoup(item.get('description') or '', 'lxml').get_text(strip=True)
+                    salary = ''
+                    if item.get('salary_min') and item.get('salary_max'):
+                        salary = f"${item['salary_min']:,} - ${item['salary_max']:,}"
+                    emails = re.findall(EMAIL_PATTERN, description)
+                    job = {
+                        'company': item.get('company') or 'N/A',
+                        'title': item.get('position') or 'N/A',
+                        'location': item.get('location') or 'Remote',
+                        'email': emails[0] if emails else '',
+                        'description': description,
+                        'url': item.get('url') or '',
+                        'salary': salary
+                    }
+                    if not self.claim_job(job):
                         continue
-                
-                time.sleep(random.uniform(2, 4))
-            
-            driver.quit()
+                    # The feed already carries the full description, so no detail fetch is needed
+                    self.pipeline.submit(job, 'Remote OK')
+                    jobs_found += 1
+                except Exception as e:
+                    logger.error(f"Error processing Remote OK feed item: {str(e)}")
             logger.info(f"Remote OK search completed. Found {jobs_found} jobs.")
             self.update_search_results(f"Remote OK search completed. Found {jobs_found} jobs.\n")
             return jobs_found
-            
-        except Exception as e:
-            logger.error(f"Error in Remote OK search: {str(e)}")
-            self.update_search_results(f"Error searching Remote OK: {str(e)}\n")
-            if 'driver' in locals():
-                driver.quit()
-            return 0
+
+        def page_url(page):
+            return f"https://remoteok.com/remote-{quote_plus(keywords)}-jobs?page={page + 1}"
+
+        def parse_card(job_card):
+            title_elem = job_card.select_one('h2')
+            company_elem = job_card.select_one('td.company')
+            url_elem = job_card.select_one('a.preventLink')
+
+            return {
+                'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
+                'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
+                'location': 'Remote',
+                'email': '',
+                'description': '',
+                'url': urljoin("https://remoteok.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
+                'salary': ''
+            }
+
+        return self.crawl_listing(
+            'Remote OK', page_url, 'tr.job', parse_card,
+            {'description': 'div.description', 'salary': 'span.salary'},
+            max_pages, query=(keywords, '')
+        )
 
     def search_weworkremotely(self, keywords, max_pages=3):
-        """Search We Work Remotely for jobs using Selenium to bypass anti-bot measures."""
-        try:
-            self.update_search_results("Searching We Work Remotely...\n")
+        """Search We Work Remotely through its RSS feed, crawling the site if the feed is unavailable."""
+        logger = logging.getLogger(__name__)
+        self.update_search_results("Searching We Work Remotely...\n")
+        with self.get_site_throttle('We Work Remotely').slot():
+            feed = self.http.get_text(
+                "https://weworkremotely.com/remote-jobs.rss",
+                ttl=self.page_cache_ttl('We Work Remotely')
+            )
+
+        if feed is not None:
             jobs_found = 0
-            logger = logging.getLogger(__name__)
-            
-            driver = self.get_edge_driver()
-            base_url = f"https://weworkremotely.com/remote-jobs/search?term={quote_plus(keywords)}"
-            
-            for page in range(max_pages):
-                url = f"{base_url}&page={page + 1}"
-                driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                soup = BeautifulSoup(driver.page_source, 'lxml')
-                job_cards = soup.select('section.jobs article')
-                
-                if not job_cards:
-                    logger.info(f"No more jobs found on We Work Remotely page {page + 1}")
-                    self.update_search_results(f"No more jobs found on We Work Remotely page {page + 1}\n")
+            terms = [kw.strip().lower() for kw in keywords.split(',') if kw.strip()]
+            for item in BeautifulSoup(feed, 'xml').find_all('item'):
+                if self.stop_search_flag:
                     break
-                    
-                for job_card in job_cards:
-                    try:
-                        title_elem = job_card.select_one('span.title')
-                        company_elem = job_card.select_one('span.company')
-                        url_elem = job_card.select_one('a')
-                        
-                        job = {
-                            'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
-                            'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
-                            'location': 'Remote',
-                            'email': '',
-                            'description': '',
-                            'url': urljoin("https://weworkremotely.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
-                            'salary': ''
-                        }
-                        
-                        if job['url']:
-                            driver.get(job['url'])
-                            time.sleep(random.uniform(1, 2))
-                            try:
-                                job_page = BeautifulSoup(driver.page_source, 'lxml')
-                                description_elem = job_page.select_one('div.listing-container')
-                                if description_elem:
-                                    job['description'] = description_elem.get_text(strip=True)
-                                salary_elem = job_page.select_one('div.salary')
-                                if salary_elem:
-                                    job['salary'] = salary_elem.get_text(strip=True)
-                                emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job['description'])
-                                if emails:
-                                    job['email'] = emails[0]
-                            except Exception as e:
-                                logger.warning(f"Error fetching details for job {job['title']}: {str(e)}")
-                        
-                        self.save_job_to_db(job)
-                        jobs_found += 1
-                        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
-                        time.sleep(random.uniform(0.5, 1))
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing We Work Remotely job card: {str(e)}")
+                try:
+                    # Feed titles look like "Company: Job Title"
+                    heading = item.title.get_text(strip=True) if item.title else ''
+                    company, _, title = heading.partition(': ')
+                    if not title:
+                        company, title = 'N/A', heading
+                    description = BeautifulSoup(item.description.get_text() if item.description else '', 'lxml').get_text(strip=True)
+                    if terms and not any(term in f"{title} {description}".lower() for term in terms):
                         continue
-                
-                time.sleep(random.uniform(2, 4))
-            
-            driver.quit()
+                    emails = re.findall(EMAIL_PATTERN, description)
+                    job = {
+                        'company': company or 'N/A',
+                        'title': title or 'N/A',
+                        'location': item.region.get_text(strip=True) if item.region else 'Remote',
+                        'email': emails[0] if emails else '',
+                        'description': description,
+                        'url': item.link.get_text(strip=True) if item.link else '',
+                        'salary': ''
+                    }
+                    if not self.claim_job(job):
+                        continue
+                    # The feed already carries the full description, so no detail fetch is needed
+                    self.pipeline.submit(job, 'We Work Remotely')
+                    jobs_found += 1
+                except Exception as e:
+                    logger.error(f"Error processing We Work Remotely feed item: {str(e)}")
             logger.info(f"We Work Remotely search completed. Found {jobs_found} jobs.")
             self.update_search_results(f"We Work Remotely search completed. Found {jobs_found} jobs.\n")
             return jobs_found
-            
-        except Exception as e:
-            logger.error(f"Error in We Work Remotely search: {str(e)}")
-            self.update_search_results(f"Error searching We Work Remotely: {str(e)}\n")
-            if 'driver' in locals():
-                driver.quit()
-            return 0
-    
+
+        def page_url(page):
+            return f"https://weworkremotely.com/remote-jobs/search?term={quote_plus(keywords)}&page={page + 1}"
+
+        def parse_card(job_card):
+            title_elem = job_card.select_one('span.title')
+            company_elem = job_card.select_one('span.company')
+            url_elem = job_card.select_one('a')
+
+            return {
+                'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
+                'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
+                'location': 'Remote',
+                'email': '',
+                'description': '',
+                'url': urljoin("https://weworkremotely.com", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
+                'salary': ''
+            }
+
+        return self.crawl_listing(
+            'We Work Remotely', page_url, 'section.jobs article', parse_card,
+            {'description': 'div.listing-container', 'salary': 'div.salary'},
+            max_pages, query=(keywords, '')
+        )
+
     def search_brightermonday(self, keywords, location, max_pages=3):
         """Search BrighterMonday for jobs using Selenium to bypass anti-bot measures."""
+        def page_url(page):
+            return f"https://www.brightermonday.co.ke/jobs?search={quote_plus(keywords)}&location={quote_plus(location)}&page={page + 1}"
+
+        def parse_card(job_card):
+            title_elem = job_card.select_one('h3')
+            company_elem = job_card.select_one('a.company-name')
+            location_elem = job_card.select_one('span.location')
+            url_elem = job_card.select_one('a')
+            description_elem = job_card.select_one('div.job-desc')
+
+            return {
+                'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
+                'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
+                'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
+                'email': '',
+                'description': description_elem.get_text(strip=True) if description_elem else '',
+                'url': urljoin("https://www.brightermonday.co.ke", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
+                'salary': ''
+            }
+
+        return self.crawl_listing(
+            'BrighterMonday', page_url, 'div.search-result', parse_card,
+            {'description': 'div.job-description', 'salary': 'span.salary'},
+            max_pages, query=(keywords, location)
+        )
+
+    def save_job_to_db(self, job):
+        """Queue job for the batched database writer (thread-safe)"""
+        self.job_writer.put(job)
+
+    def update_search_results(self, message):
+        """Queue a message for the search results box (safe from any thread)"""
+        self.search_log.append(message)
+
+    def drain_search_log(self):
+        """Show the buffered search messages in one insert, then reschedule itself"""
         try:
-            self.update_search_results("Searching BrighterMonday...\n")
-            jobs_found = 0
-            logger = logging.getLogger(__name__)
-            
-            driver = self.get_edge_driver()
-            
-            base_url = "https://www.brightermonday.co.ke/jobs"
-            
-            for page in range(max_pages):
-                url = f"{base_url}?search={quote_plus(keywords)}&location={quote_plus(location)}&page={page + 1}"
-                driver.get(url)
-                time.sleep(random.uniform(2, 4))
-                soup = BeautifulSoup(driver.page_source, 'lxml')
-                job_cards = soup.select('div.search-result')
-                
-                if not job_cards:
-                    logger.info(f"No more jobs found on BrighterMonday page {page + 1}")
-                    self.update_search_results(f"No more jobs found on BrighterMonday page {page + 1}\n")
-                    break
-                    
-                for job_card in job_cards:
-                    try:
-                        title_elem = job_card.select_one('h3')
-                        company_elem = job_card.select_one('a.company-name')
-                        location_elem = job_card.select_one('span.location')
-                        url_elem = job_card.select_one('a')
-                        description_elem = job_card.select_one('div.job-desc')
-                        
-                        job = {
-                            'company': company_elem.get_text(strip=True) if company_elem else 'N/A',
-                            'title': title_elem.get_text(strip=True) if title_elem else 'N/A',
-                            'location': location_elem.get_text(strip=True) if location_elem else 'N/A',
-                            'email': '',
-                            'description': description_elem.get_text(strip=True) if description_elem else '',
-                            'url': urljoin("https://www.brightermonday.co.ke", url_elem['href']) if url_elem and url_elem.has_attr('href') else '',
-                            'salary': ''
-                        }
-                        
-                        if job['url']:
-                            driver.get(job['url'])
-                            time.sleep(random.uniform(1, 2))
-                            try:
-                                job_page = BeautifulSoup(driver.page_source, 'lxml')
-                                description_elem = job_page.select_one('div.job-description')
-                                if description_elem:
-                                    job['description'] = description_elem.get_text(strip=True)
-                                salary_elem = job_page.select_one('span.salary')
-                                if salary_elem:
-                                    job['salary'] = salary_elem.get_text(strip=True)
-                                emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job['description'])
-                                if emails:
-                                    job['email'] = emails[0]
-                            except Exception as e:
-                                logger.warning(f"Error fetching details for job {job['title']}: {str(e)}")
-                        
-                        self.save_job_to_db(job)
-                        jobs_found += 1
-                        self.update_search_results(f"Found: {job['title']} at {job['company']}\n")
-                        time.sleep(random.uniform(0.5, 1))
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing BrighterMonday job card: {str(e)}")
-                        continue
-                
-                time.sleep(random.uniform(2, 4))
-            
-            driver.quit()
-            logger.info(f"BrighterMonday search completed. Found {jobs_found} jobs.")
-            self.update_search_results(f"BrighterMonday search completed. Found {jobs_found} jobs.\n")
-            return jobs_found
-            
-        except Exception as e:
-            logger.error(f"Error in BrighterMonday search: {str(e)}")
-            self.update_search_results(f"Error searching BrighterMonday: {str(e)}\n")
-            if 'driver' in locals():
-                driver.quit()
-            return 0
+            text = self.search_log.drain()
+            if text:
+                # Only follow the end if the user has not scrolled up to read
+                at_end = self.search_results.yview()[1] >= 0.999
+                self.search_results.insert(tk.END, text)
+                lines = int(self.search_results.index('end-1c').split('.')[0])
+                if lines > self.max_log_lines:
+                    self.search_results.delete('1.0', f'{lines - self.max_log_lines + 1}.0')
+                if at_end:
+                    self.search_results.see(tk.END)
+        finally:
+            self.root.after(self.log_interval_ms, self.drain_search_log)
     
-    def save_job_to_db(self, job):
-        """Save job to database (thread-safe)"""
+    def refresh_jobs(self, reload=False):
+        """
+        Bring the jobs list up to date. Only the rows changed since the last
+        refresh are touched unless the search changed or reload is set.
+        """
+        query = fts_query(self.job_search_entry.get()) if self.fts_available else ''
+        if query:
+            source, where, params = 'jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid', 'jobs_fts MATCH ?', (query,)
+        else:
+            source, where, params = 'jobs', '', ()
+        pager = self.jobs_pager
+        if not reload and (pager.source, pager.where, pager.params) == (source, where, params):
+            pager.sync()
+            return
         try:
-            # Create a new connection for this thread
-            conn = sqlite3.connect('job_applications.db')
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO jobs (company_name, job_title, job_description, email, url, location, date_found)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                job['company'],
-                job['title'],
-                job['description'],
-                job['email'],
-                job['url'],
-                job['location'],
-                datetime.now().strftime('%Y-%m-%d')
-            ))
-            conn.commit()
-            conn.close()
+            if query:
+                # Best text matches first, with hits in the title counting most
+                pager.load(source, where, params, sort='Match', descending=False)
+            else:
+                # Best matches for the CV first once jobs have been ranked, newest first otherwise
+                pager.load(source, sort='Relevance' if pager.sort in (None, 'Match') else None)
+        except sqlite3.OperationalError as e:
+            messagebox.showwarning("Search", f"Invalid search: {str(e)}")
+        
+    def rank_jobs(self, then=None):
+        """Score every stored job against the loaded CV in the background and show them best first.
+
+        then, if given, is called on the Tk thread once the scores are stored.
+        """
+        if not self.cv_content:
+            self.refresh_jobs()
+            if then:
+                then()
+            return
+        if then:
+            self.rank_callbacks.append(then)
+        if self.rank_thread is not None and self.rank_thread.is_alive():
+            # Jobs or the CV may have changed since that run started
+            self.rank_again = True
+            return
+        self.rank_again = False
+        self.rank_thread = threading.Thread(target=self.compute_relevance, args=(self.cv_content,), daemon=True)
+        self.rank_thread.start()
+
+    def compute_relevance(self, cv_text):
+        """Score the jobs and store the scores that changed (ranking thread)"""
+        start = time.perf_counter()
+        changed = 0
+        conn = None
+        try:
+            conn = connect_db()
+            self.job_writer.flush()
+            self.relevance_index.refresh()
+            job_ids, scores = self.relevance_index.score(cv_text)
+            changed = store_relevance(conn, job_ids, scores)
+            logging.getLogger(__name__).info(
+                f"Ranked {len(job_ids)} jobs against the CV in {(time.perf_counter() - start) * 1000:.0f} ms "
+                f"({changed} scores changed)"
+            )
         except Exception as e:
-            print(f"Error saving job to database: {str(e)}")
-    
-    def update_search_results(self, message):
-        """Update search results text box"""
-        self.root.after(0, lambda: self.search_results.insert(tk.END, message))
-        self.root.after(0, lambda: self.search_results.see(tk.END))
-    
-    def refresh_jobs(self):
-        """Refresh jobs in the treeview"""
-        # Clear existing items
-        for item in self.jobs_tree.get_children():
-            self.jobs_tree.delete(item)
-        
-        # Fetch jobs from database
-        self.cursor.execute('SELECT id, company_name, job_title, location, email, url, status FROM jobs ORDER BY date_found DESC')
-        jobs = self.cursor.fetchall()
+            logging.getLogger(__name__).error(f"Error ranking jobs: {str(e)}")
+        finally:
+            if conn is not None:
+                conn.close()
+            # Always finish, so the callbacks waiting on this run are released
+            self.root.after(0, self.finish_ranking, changed)
+
+    def finish_ranking(self, changed):
+        """Show the new order and run the callbacks waiting for it (Tk thread)"""
+        # Scores are not tracked as row changes, so a new order needs a reload
+        self.refresh_jobs(reload=bool(changed))
+        if self.rank_again:
+            self.rank_jobs()
+            return
+        callbacks, self.rank_callbacks = self.rank_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def clear_job_search(self):
+        """Clear the search box and show every job again"""
+        self.job_search_entry.delete(0, tk.END)
+        self.refresh_jobs()
 
-        for job in jobs:
-            self.jobs_tree.insert('', 'end', values=(job[1], job[2], job[3], job[4], job[5], job[6]), tags=(job[0],))
-        
     def on_job_select(self, event):
         """Handle job selection"""
         selection = self.jobs_tree.selection()
@@ -1199,7 +3839,11 @@ class JobSearchApp:
             job_id = item['tags'][0]
             
             # Fetch full job details
-            self.cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+            self.cursor.execute('''
+                SELECT id, company_name, job_title, job_description, email, url, location, salary,
+                       date_found, status, canonical_id
+                FROM jobs WHERE id = ?
+            ''', (job_id,))
             job = self.cursor.fetchone()
             
             if job:
@@ -1209,7 +3853,16 @@ class JobSearchApp:
                 details += f"Email: {job[4]}\n"
                 details += f"URL: {job[5]}\n"
                 details += f"Date Found: {job[8]}\n"
-                details += f"Status: {job[9]}\n\n"
+                details += f"Status: {job[9]}\n"
+                if job[10]:
+                    details += f"Duplicate of job #{job[10]} (no application is generated for it)\n"
+                try:
+                    skills = [name for name, count in keyword_matcher().find(job[3] or '')]
+                except OSError:
+                    skills = []
+                if skills:
+                    details += f"Skills: {', '.join(skills[:15])}\n"
+                details += "\n"
                 details += f"Description:\n{job[3]}\n"
 
                 self.job_details.delete('1.0', tk.END)
@@ -1223,23 +3876,35 @@ class JobSearchApp:
             job_id = item['tags'][0]
             
             if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this job?"):
+                self.relevance_index.remove([int(job_id)])
+                # The oldest near-duplicate of the job takes its place as canonical
+                self.cursor.execute('SELECT id FROM jobs WHERE canonical_id = ? ORDER BY id LIMIT 1', (job_id,))
+                successor = self.cursor.fetchone()
+                if successor:
+                    self.cursor.execute('UPDATE jobs SET canonical_id = NULL WHERE id = ?', successor)
+                    self.cursor.execute('UPDATE jobs SET canonical_id = ? WHERE canonical_id = ?', (successor[0], job_id))
+                self.cursor.execute('DELETE FROM job_lsh WHERE job_id = ?', (job_id,))
+                self.cursor.execute('DELETE FROM job_vectors WHERE job_id = ?', (job_id,))
                 self.cursor.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
                 self.conn.commit()
                 self.refresh_jobs()
     
-    def summarize_experience(self, experience_text):
+    def extract_experience(self, cv_text):
         """
-        Summarize the relevant experience using a free language model.
+        Return the work experience section of the CV, or the whole CV if no such heading is found.
         """
-        # Hugging Face models have input length limits (1024 tokens for BART)
-        if not experience_text.strip():
-            return ""
-        try:
-            summary = self.summarizer(experience_text[:1024], max_length=80, min_length=30, do_sample=False)[0]['summary_text']
-            return summary
-        except Exception as e:
-            return experience_text[:300]  # fallback: first 300 chars
-    
+        lines = cv_text.split('\n')
+        start = None
+        for i, line in enumerate(lines):
+            heading = line.strip().lower().rstrip(':')
+            if start is None and heading in EXPERIENCE_HEADINGS:
+                start = i + 1
+            elif start is not None and heading in OTHER_CV_HEADINGS:
+                return '\n'.join(lines[start:i]).strip()
+        if start is None:
+            return cv_text.strip()
+        return '\n'.join(lines[start:]).strip()
+
     def get_relevant_experience(self, job_title, keywords):
         """
         Extract and return relevant experience lines from CV that match the job title or keywords.
@@ -1261,8 +3926,31 @@ class JobSearchApp:
         return "\n".join(relevant_lines)
     
     def generate_applications(self):
-        """Generate email applications for all jobs"""
-        self.cursor.execute('SELECT * FROM jobs WHERE status = "Found"')
+        """Generate email applications for all jobs (summaries are made in the background)"""
+        if self.generation_future is not None:
+            messagebox.showinfo("Generating", "Applications are already being generated.")
+            return
+
+        # With a CV loaded the best matching jobs come first, so Top N picks them
+        self.generate_button.config(state='disabled')
+        self.rank_jobs(then=self.queue_applications)
+
+    def queue_applications(self):
+        """Pick the jobs to apply for and start summarizing their experience (Tk thread)"""
+        self.generate_button.config(state='normal')
+        if self.generation_future is not None:
+            return
+        try:
+            top_n = max(0, int(self.top_n_var.get()))
+        except (tk.TclError, ValueError):
+            top_n = 0
+        self.cursor.execute('''
+            SELECT id, company_name, job_title, job_description, email, url, location, salary,
+                   date_found, status, applied_date, notes
+            FROM jobs WHERE status = "Found" AND canonical_id IS NULL AND email IS NOT NULL AND email != ''
+            ORDER BY relevance IS NULL, relevance DESC, date_found DESC
+            LIMIT ?
+        ''', (top_n or -1,))
         jobs = self.cursor.fetchall()
         
         if not jobs:
@@ -1272,8 +3960,11 @@ class JobSearchApp:
         subject_template = self.subject_template.get()
         body_template = self.body_template.get('1.0', tk.END)
         
-        generated_count = 0
-        
+        keywords = self.keywords_entry.get()
+        self.change_summary_batch_size()
+
+        # Collect every job's experience first so the model can run in batches
+        pending = []
         for job in jobs:
             job_id, company_name, job_title, description, email, url, location, salary, date_found, status, applied_date, notes = job
             
@@ -1287,8 +3978,61 @@ class JobSearchApp:
             )
             
             # Get relevant experience for this job
-            relevant_experience = self.get_relevant_experience(job_title, self.keywords_entry.get())
-            summarized_exp = self.summarize_experience(relevant_experience)
+            relevant_experience = self.get_relevant_experience(job_title, keywords)
+            pending.append((job_id, email, subject, job_title, company_name, location, relevant_experience))
+
+        if not pending:
+            messagebox.showinfo("Applications Generated", "Generated 0 email applications.")
+            return
+
+        future = self.summarizer.submit(
+            [item[-1] for item in pending],
+            self.summary_params,
+            batch_size=self.summary_batch_size,
+            max_reduce_rounds=self.max_reduce_rounds,
+            on_progress=lambda done, total: self.root.after(0, self.show_generation_progress, done, total)
+        )
+        self.generation_future = future
+        self.generate_button.config(state='disabled')
+        self.cancel_generation_button.config(state='normal')
+        self.generation_progress.config(value=0)
+        self.generation_label.config(text=f"Summarizing experience for {len(pending)} jobs...")
+        future.add_done_callback(
+            lambda f: self.root.after(0, self.finish_applications, f, pending, body_template)
+        )
+
+    def show_generation_progress(self, done, total):
+        """Update the generation progress bar (Tk thread)"""
+        if self.generation_future is None:
+            return
+        self.generation_progress.config(maximum=max(total, 1), value=done)
+        self.generation_label.config(text=f"Summarizing: {done}/{total}")
+
+    def cancel_generation(self):
+        """Cancel the running application generation"""
+        if self.generation_future is not None:
+            self.summarizer.cancel()
+            self.generation_label.config(text="Cancelling...")
+
+    def finish_applications(self, future, pending, body_template):
+        """Queue the generated emails once the summaries are ready (Tk thread)"""
+        self.generation_future = None
+        self.generate_button.config(state='normal')
+        self.cancel_generation_button.config(state='disabled')
+        self.generation_progress.config(value=0)
+        if future.cancelled():
+            self.generation_label.config(text="Generation cancelled")
+            return
+        try:
+            summaries, hits, misses = future.result()
+        except Exception as e:
+            self.generation_label.config(text="")
+            messagebox.showerror("Error", f"Failed to generate applications: {str(e)}")
+            return
+        self.generation_label.config(text="")
+
+        generated_count = 0
+        for (job_id, email, subject, job_title, company_name, location, _), summarized_exp in zip(pending, summaries):
             if summarized_exp:
                 experience_block = f"\nRelevant Experience:\n{summarized_exp}\n"
             else:
@@ -1310,7 +4054,12 @@ class JobSearchApp:
             generated_count += 1
         
         self.conn.commit()
-        messagebox.showinfo("Applications Generated", f"Generated {generated_count} email applications.")
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        logging.getLogger(__name__).info(f"Summary cache hit rate: {hit_rate:.0%}")
+        messagebox.showinfo(
+            "Applications Generated",
+            f"Generated {generated_count} email applications.\nSummary cache hit rate: {hit_rate:.0%}"
+        )
         self.refresh_email_queue()
     
     def test_email_connection(self):
@@ -1356,22 +4105,11 @@ class JobSearchApp:
             self.cover_letter_label.config(text=f"Cover Letter: {os.path.basename(file_path)}")
     
     def refresh_email_queue(self):
-        """Refresh email queue"""
-        # Clear existing items
-        for item in self.email_tree.get_children():
-            self.email_tree.delete(item)
-        
-        # Fetch emails from database
-        self.cursor.execute('''
-            SELECT eq.id, j.company_name, j.job_title, eq.recipient_email, eq.status
-            FROM email_queue eq
-            JOIN jobs j ON eq.job_id = j.id
-            ORDER BY eq.created_date DESC
-        ''')
-        emails = self.cursor.fetchall()
-        
-        for email in emails:
-            self.email_tree.insert('', 'end', values=(email[1], email[2], email[3], email[4]), tags=(email[0],))
+        """Bring the email queue up to date, touching only the rows changed since the last refresh"""
+        if self.email_pager.source is None:
+            self.email_pager.load('email_queue eq JOIN jobs j ON eq.job_id = j.id', sort='Created')
+        else:
+            self.email_pager.sync()
     
     def on_email_select(self, event):
         """Handle email selection"""
@@ -1393,6 +4131,15 @@ class JobSearchApp:
                 preview = f"To: {email[2]}\n"
                 preview += f"Subject: {email[3]}\n\n"
                 preview += f"{email[4]}\n"
+
+                self.cursor.execute(
+                    'SELECT status, attempts, next_attempt, last_error FROM email_queue WHERE id = ?', (email_id,)
+                )
+                status, attempts, next_attempt, last_error = self.cursor.fetchone()
+                if last_error:
+                    preview += f"\n{status} after {attempts} attempt(s): {last_error}\n"
+                    if status == 'Retrying':
+                        preview += f"Next attempt: {next_attempt}\n"
                 
                 self.email_preview.delete('1.0', tk.END)
                 self.email_preview.insert('1.0', preview)
@@ -1405,21 +4152,51 @@ class JobSearchApp:
             return
         
         email_ids = [self.email_tree.item(item)['tags'][0] for item in selection]
+        if self.email_sender is not None:
+            messagebox.showinfo("Sending", "Emails are already being sent.")
+            return
+
+        # Failed emails are only sent again when the user asks for it;
+        # emails already sent never are
+        placeholders = ','.join('?' * len(email_ids))
+        self.cursor.execute(f'SELECT id FROM email_queue WHERE status = "Failed" AND id IN ({placeholders})', email_ids)
+        failed_ids = [row[0] for row in self.cursor.fetchall()]
+        if failed_ids and messagebox.askyesno(
+            "Retry Failed Emails",
+            f"{len(failed_ids)} of the selected emails failed before. Some may have been delivered "
+            f"if sending was interrupted. Send them again?"
+        ):
+            self.cursor.executemany('''
+                UPDATE email_queue SET status = 'Pending', attempts = 0, next_attempt = NULL, last_error = NULL
+                WHERE id = ? AND status = 'Failed'
+            ''', [(email_id,) for email_id in failed_ids])
+            self.conn.commit()
+
+        self.cursor.execute(
+            f'SELECT COUNT(*) FROM email_queue WHERE status IN ("Pending", "Retrying") AND id IN ({placeholders})',
+            email_ids
+        )
+        if not self.cursor.fetchone()[0]:
+            messagebox.showinfo("No Emails", "None of the selected emails are waiting to be sent.")
+            return
         self.send_emails(email_ids)
     
     def send_all_emails(self):
-        """Send all pending emails"""
-        self.cursor.execute('SELECT id FROM email_queue WHERE status = "Pending"')
-        email_ids = [row[0] for row in self.cursor.fetchall()]
+        """Send all pending emails, including those waiting for a retry"""
+        self.cursor.execute('SELECT COUNT(*) FROM email_queue WHERE status IN ("Pending", "Retrying")')
         
-        if not email_ids:
+        if not self.cursor.fetchone()[0]:
             messagebox.showinfo("No Emails", "No pending emails to send.")
             return
         
-        self.send_emails(email_ids)
+        self.send_emails()
     
-    def send_emails(self, email_ids):
-        """Send emails by IDs"""
+    def send_emails(self, email_ids=None):
+        """Send emails by IDs, or all queued ones, in the background"""
+        if self.email_sender is not None:
+            messagebox.showinfo("Sending", "Emails are already being sent.")
+            return
+
         # Get email settings
         smtp_server = self.smtp_server_entry.get()
         smtp_port = int(self.smtp_port_entry.get())
@@ -1438,105 +4215,60 @@ class JobSearchApp:
         if not cv_attachment:
             messagebox.showwarning("Warning", "Please select a CV file for attachment")
             return
-        
-        sent_count = 0
-        failed_count = 0
-        
+
         try:
-            # Connect to SMTP server
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(sender_email, password)
-            
-            for email_id in email_ids:
-                try:
-                    # Fetch email details
-                    self.cursor.execute('SELECT * FROM email_queue WHERE id = ?', (email_id,))
-                    email_data = self.cursor.fetchone()
-                    
-                    if not email_data:
-                        continue
-                    
-                    _, job_id, recipient_email, subject, body, status, created_date, sent_date = email_data
-                    
-                    # Create email message
-                    msg = MIMEMultipart()
-                    msg['From'] = f"{sender_name} <{sender_email}>"
-                    msg['To'] = recipient_email
-                    msg['Subject'] = subject
-                    
-                    # Add body
-                    msg.attach(MIMEText(body, 'plain'))
-                    
-                    # Add CV attachment
-                    if cv_attachment:
-                        with open(cv_attachment, 'rb') as attachment:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(attachment.read())
-                            encoders.encode_base64(part)
-                            part.add_header(
-                                'Content-Disposition',
-                                f'attachment; filename= {os.path.basename(cv_attachment)}'
-                            )
-                            msg.attach(part)
-                    
-                    # Add cover letter attachment
-                    if cover_letter:
-                        with open(cover_letter, 'rb') as attachment:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(attachment.read())
-                            encoders.encode_base64(part)
-                            part.add_header(
-                                'Content-Disposition',
-                                f'attachment; filename= {os.path.basename(cover_letter)}'
-                            )
-                            msg.attach(part)
-                    
-                    # Send email
-                    server.send_message(msg)
-                    
-                    # Update email status
-                    self.cursor.execute('''
-                        UPDATE email_queue 
-                        SET status = "Sent", sent_date = ?
-                        WHERE id = ?
-                    ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), email_id))
-                    
-                    # Update job status
-                    self.cursor.execute('''
-                        UPDATE jobs 
-                        SET status = "Applied", applied_date = ?
-                        WHERE id = ?
-                    ''', (datetime.now().strftime('%Y-%m-%d'), job_id))
-                    
-                    sent_count += 1
-                    
-                    # Small delay to avoid overwhelming servers
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    print(f"Error sending email {email_id}: {str(e)}")
-                    failed_count += 1
-                    
-                    # Update email status to failed
-                    self.cursor.execute('''
-                        UPDATE email_queue 
-                        SET status = "Failed"
-                        WHERE id = ?
-                    ''', (email_id,))
-            
-            server.quit()
-            self.conn.commit()
-            
-            messagebox.showinfo("Email Sending Complete", 
-                              f"Sent: {sent_count} emails\nFailed: {failed_count} emails")
-            
-            # Refresh displays
-            self.refresh_email_queue()
-            self.refresh_jobs()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to send emails: {str(e)}")
+            rate_per_minute = max(1, int(self.email_rate_var.get()))
+            connections = max(1, int(self.smtp_connections_var.get()))
+        except (tk.TclError, ValueError):
+            messagebox.showwarning("Warning", "Send rate and connections must be whole numbers")
+            return
+
+        def build_message(recipient_email, subject, body, message_id):
+            return build_email_message(
+                f"{sender_name} <{sender_email}>", recipient_email, subject, body, message_id,
+                (cv_attachment, cover_letter), self.attachment_cache
+            )
+
+        self.email_sender = EmailSender(
+            SmtpPool(smtp_server, smtp_port, sender_email, password, size=connections),
+            TokenBucket(rate_per_minute / 60.0, capacity=connections),
+            build_message,
+            on_progress=lambda sent, failed, total: self.root.after(0, self.show_send_progress, sent, failed, total),
+            on_done=lambda sent, failed, cancelled: self.root.after(0, self.finish_sending, sent, failed, cancelled)
+        )
+        self.cancel_send_button.config(state='normal')
+        self.send_progress.config(value=0)
+        self.send_status_label.config(text="Sending emails...")
+        self.email_sender.start(email_ids)
+
+    def show_send_progress(self, sent, failed, total):
+        """Update the sending progress (Tk thread)"""
+        self.send_progress.config(maximum=max(total, 1), value=sent + failed)
+        self.send_status_label.config(text=f"Sent {sent}, failed {failed} of {total}")
+        self.refresh_email_queue()
+
+    def cancel_sending(self):
+        """Stop sending after the messages already in flight"""
+        if self.email_sender is not None:
+            self.email_sender.cancel()
+            self.send_status_label.config(text="Cancelling...")
+
+    def finish_sending(self, sent, failed, cancelled):
+        """Report the result of a send run (Tk thread)"""
+        self.email_sender = None
+        self.cancel_send_button.config(state='disabled')
+        self.send_status_label.config(text="")
+        self.send_progress.config(value=0)
+
+        title = "Email Sending Cancelled" if cancelled else "Email Sending Complete"
+        message = f"Sent: {sent} emails\nFailed: {failed} emails"
+        if cancelled:
+            message += "\n\nUnsent emails stay queued; Send All resumes them."
+        messagebox.showinfo(title, message)
+        
+        # Refresh displays
+        self.refresh_email_queue()
+        self.refresh_jobs()
     
     def delete_selected_email(self):
         """Delete selected email from queue"""
@@ -1555,13 +4287,18 @@ class JobSearchApp:
             self.refresh_email_queue()
     
     def __del__(self):
-        """Cleanup database connection"""
+        """Cleanup database connection and browsers"""
+        if hasattr(self, 'job_writer'):
+            self.job_writer.close()
+        if hasattr(self, 'driver_pool'):
+            self.driver_pool.close()
         if hasattr(self, 'conn'):
             self.conn.close()
 
 
 def main():
     """Main function to run the application"""
+    load_dotenv()
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",
@@ -1584,7 +4321,16 @@ def main():
             app.conn.close()
         root.destroy()
     finally:
+        # Make sure every scraped job reaches the database before exiting
+        app.job_writer.close()
+        app.driver_pool.close()
+        app.summarizer.close()
+        if app.email_sender is not None:
+            # Emails not yet claimed stay Pending for the next run
+            app.email_sender.cancel()
         logging.info("Application closed.")
 
 if __name__ == "__main__":
+    # Needed for the summarizer process in frozen Windows builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file